@@ -1,5 +1,8 @@
 import bpy
+import csv
+import json
 import time
+import numpy as np
 
 class GeometryToolsPanel(bpy.types.Panel):
     """Panel for Geometry Tools."""
@@ -20,19 +23,797 @@ class GeometryToolsPanel(bpy.types.Panel):
         # Checkboxes for skipping triblock and quadblock validation
         col.prop(context.scene, "skip_triblock", text="No Triblock")
         col.prop(context.scene, "skip_quadblock", text="No Quadblock")
+        col.prop(context.scene, "check_topology", text="Check Topology")
+        col.prop(context.scene, "check_uv_area", text="Check UV Area")
+        col.prop(context.scene, "check_uv_texel_grid", text="Check Texel Grid")
 
         # Botones
         col.operator("geometry.find_objects", text="Find")
         col.separator()
         col.operator("geometry.find_invalid", text="Find Invalid Geometry")
+        # Contador en vivo, refrescado por el handler del depsgraph
+        if context.scene.find_executed and invalid_block_count is not None:
+            row = col.row()
+            row.alert = invalid_block_count > 0
+            row.label(text=f"{invalid_block_count} invalid blocks", icon='ERROR' if invalid_block_count else 'CHECKMARK')
         col.separator()
-        col.operator("geometry.reset_name", text="Reset Name")
+        col.prop(context.scene, "duplicate_tolerance", text="Duplicate Tolerance")
+        col.operator("geometry.find_duplicates", text="Find Duplicates")
         col.separator()
+        col.operator("geometry.reset_name", text="Reset Results")
+        col.separator()
+        col.operator("geometry.quarantine_invalid_data", text="Quarantine Invalid Data")
+        quarantined = bpy.data.collections.get(QUARANTINE_COLLECTION)
+        if quarantined is not None and quarantined.objects:
+            col.label(text=f"{len(quarantined.objects)} objects in quarantine")
+            col.operator("geometry.restore_quarantined", text="Restore Quarantined")
         col.operator("geometry.remove_invalid_data", text="Remove Invalid Data")
+        col.operator("geometry.export_report", text="Export Report", icon='EXPORT')
+
+
+# Códigos de clasificación por objeto
+BLOCK_INVALID = 0
+BLOCK_TRIBLOCK = 1
+BLOCK_QUADBLOCK = 2
+# Código numérico de cada clase guardada en Object.block_class
+CLASS_CODES = {'TRIBLOCK': BLOCK_TRIBLOCK, 'QUADBLOCK': BLOCK_QUADBLOCK}
+
+
+def gather_block_counts(objects):
+    """Lee en bloque los conteos de vértices, aristas y caras y el máximo de lados por cara.
+
+    Devuelve cuatro arrays alineados con ``objects``. Los ``loop_total`` de todas las
+    caras se leen con ``foreach_get`` en un único array contiguo.
+    """
+    meshes = [obj.data for obj in objects]
+    count = len(meshes)
+    vertex_counts = np.fromiter((len(me.vertices) for me in meshes), dtype=np.int32, count=count)
+    edge_counts = np.fromiter((len(me.edges) for me in meshes), dtype=np.int32, count=count)
+    face_counts = np.fromiter((len(me.polygons) for me in meshes), dtype=np.int32, count=count)
+
+    total_faces = int(face_counts.sum())
+    loop_totals = np.empty(total_faces, dtype=np.int32)
+    offset = 0
+    for me, faces in zip(meshes, face_counts.tolist()):
+        if faces:
+            me.polygons.foreach_get("loop_total", loop_totals[offset:offset + faces])
+            offset += faces
+
+    # Máximo de lados por objeto; los objetos sin caras se quedan en 0.
+    max_sides = np.zeros(count, dtype=np.int32)
+    has_faces = face_counts > 0
+    if total_faces:
+        starts = np.cumsum(face_counts) - face_counts
+        max_sides[has_faces] = np.maximum.reduceat(loop_totals, starts[has_faces])
+
+    return vertex_counts, edge_counts, face_counts, max_sides
+
+
+def classify_blocks(vertex_counts, edge_counts, face_counts, max_sides):
+    """Clasifica todos los objetos a la vez como triblock, quadblock o inválido."""
+    no_ngons = max_sides <= 4
+    triblock = no_ngons & (vertex_counts == 6) & (edge_counts == 9) & (face_counts == 4)
+    quadblock = no_ngons & (vertex_counts == 9) & (edge_counts == 12) & (face_counts == 4)
+
+    codes = np.full(len(vertex_counts), BLOCK_INVALID, dtype=np.int8)
+    codes[triblock] = BLOCK_TRIBLOCK
+    codes[quadblock] = BLOCK_QUADBLOCK
+    return codes
+
+
+def classify_objects(objects):
+    """Atajo que lee los conteos y clasifica una lista de objetos MESH en una sola pasada."""
+    return classify_blocks(*gather_block_counts(objects))
+
+
+# Firma topológica esperada por clase: lados por cara, usos de cada vértice por las
+# caras y usos de cada arista por las caras (ordenados de menor a mayor).
+# Quadblock: rejilla 3x3 con un vértice central compartido por los 4 quads.
+# Triblock: triángulo subdividido con 3 puntos medios compartidos por 3 caras.
+BLOCK_TOPOLOGY = {
+    BLOCK_QUADBLOCK: (4, (1, 1, 1, 1, 2, 2, 2, 2, 4), (1,) * 8 + (2,) * 4),
+    BLOCK_TRIBLOCK: (3, (1, 1, 1, 3, 3, 3), (1,) * 6 + (2,) * 3),
+}
+# Área mínima para considerar que una cara no está colapsada
+MIN_FACE_AREA = 1e-8
+
+
+def check_block_topology(objects, code):
+    """Valida en bloque la conectividad real de objetos que ya cumplen los conteos de ``code``.
+
+    Lee los arrays de loops y áreas de todos los objetos con ``foreach_get`` y comprueba
+    a la vez el patrón de uso de vértices y aristas, el sentido de giro de las caras y
+    que ninguna cara esté colapsada. Devuelve un array booleano alineado con ``objects``.
+    """
+    sides, vertex_uses, edge_uses = BLOCK_TOPOLOGY[code]
+    count = len(objects)
+    faces = 4
+    loops_per_block = faces * sides
+
+    loop_totals = np.zeros((count, faces), dtype=np.int32)
+    loop_verts = np.zeros((count, loops_per_block), dtype=np.int32)
+    loop_edges = np.zeros((count, loops_per_block), dtype=np.int32)
+    areas = np.zeros((count, faces), dtype=np.float32)
+    ok = np.ones(count, dtype=bool)
+
+    for index, obj in enumerate(objects):
+        mesh = obj.data
+        if len(mesh.loops) != loops_per_block:
+            ok[index] = False
+            continue
+        mesh.polygons.foreach_get("loop_total", loop_totals[index])
+        mesh.polygons.foreach_get("area", areas[index])
+        mesh.loops.foreach_get("vertex_index", loop_verts[index])
+        mesh.loops.foreach_get("edge_index", loop_edges[index])
+
+    # Todas las caras deben tener el mismo número de lados.
+    ok &= (loop_totals == sides).all(axis=1)
+
+    # Cuántas caras usan cada vértice y cada arista (vértice central, puntos medios...).
+    vertex_count = len(vertex_uses)
+    edge_count = len(edge_uses)
+    vertex_hist = (loop_verts[:, :, None] == np.arange(vertex_count)).sum(axis=1)
+    edge_hist = (loop_edges[:, :, None] == np.arange(edge_count)).sum(axis=1)
+    ok &= (np.sort(vertex_hist, axis=1) == vertex_uses).all(axis=1)
+    ok &= (np.sort(edge_hist, axis=1) == edge_uses).all(axis=1)
+
+    # Ninguna cara repite vértices.
+    face_verts = loop_verts.reshape(count, faces, sides)
+    sorted_face_verts = np.sort(face_verts, axis=2)
+    ok &= (np.diff(sorted_face_verts, axis=2) != 0).all(axis=(1, 2))
+
+    # Giro coherente: una arista dirigida (a -> b) no puede aparecer en dos caras.
+    directed = face_verts * vertex_count + np.roll(face_verts, -1, axis=2)
+    sorted_directed = np.sort(directed.reshape(count, loops_per_block), axis=1)
+    ok &= (np.diff(sorted_directed, axis=1) != 0).all(axis=1)
+
+    # Caras no degeneradas.
+    ok &= (areas > MIN_FACE_AREA).all(axis=1)
+    return ok
+
+
+def validate_topology(objects, codes):
+    """Aplica ``check_block_topology`` a los triblocks y quadblocks de ``codes``."""
+    topology_ok = np.zeros(len(objects), dtype=bool)
+    for code in BLOCK_TOPOLOGY:
+        indices = np.flatnonzero(codes == code)
+        if len(indices):
+            topology_ok[indices] = check_block_topology([objects[i] for i in indices.tolist()], code)
+    return topology_ok
+
+
+# Caché de validación persistente:
+# (session_uid de la malla, tamaño de la imagen) -> (huella, código, topología_ok, problemas_uv)
+validation_cache = {}
+# Mallas que el depsgraph reportó como modificadas desde la última validación
+dirty_meshes = set()
+# Tamaño de la imagen de cada material: session_uid del material -> (ancho, alto).
+# Se vacía cuando el depsgraph reporta cambios en materiales o imágenes.
+material_image_sizes = {}
+# Número de objetos inválidos mostrado en el panel (None hasta la primera validación)
+invalid_block_count = None
+
+
+def mesh_fingerprint(mesh):
+    """Huella barata de la geometría: solo conteos, sin recorrer datos."""
+    return (len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops), len(mesh.uv_layers))
+
+
+# Problemas de UV detectados por check_uvs (máscara de bits por objeto)
+UV_OUT_OF_RANGE = 1
+UV_OFF_TEXEL_GRID = 2
+UV_ZERO_AREA = 4
+# Distancia máxima (en texels) a la rejilla de la imagen asignada
+TEXEL_TOLERANCE = 0.01
+# Área mínima en espacio UV para considerar que una cara no está colapsada
+MIN_UV_AREA = 1e-10
+
+
+def bound_image_size(obj):
+    """Tamaño (ancho, alto) de la imagen del material activo, o (0, 0) si no hay.
+
+    El árbol de nodos se recorre una vez por material; después sale de material_image_sizes.
+    """
+    material = obj.active_material
+    if material is None:
+        return (0, 0)
+    size = material_image_sizes.get(material.session_uid)
+    if size is None:
+        size = (0, 0)
+        if material.use_nodes:
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image:
+                    size = tuple(node.image.size)
+                    break
+        material_image_sizes[material.session_uid] = size
+    return size
+
+
+def check_uvs(objects):
+    """Comprueba todas las capas UV de ``objects`` en una sola pasada vectorizada.
+
+    Las UVs de todas las capas se leen con ``foreach_get`` en un único array. Con una
+    reducción min/max por capa se detectan las coordenadas fuera de [0, 1]; además se
+    comprueba que caigan en la rejilla de texels de la imagen asignada y que ninguna
+    cara tenga área nula en espacio UV. Devuelve una máscara ``UV_*`` por objeto.
+    """
+    masks = np.zeros(len(objects), dtype=np.int8)
+
+    # Un segmento por cada (objeto, capa UV)
+    segment_objects, segment_layers = [], []
+    loop_starts, loop_totals, image_sizes = [], [], []
+    for index, obj in enumerate(objects):
+        mesh = obj.data
+        if not mesh.uv_layers or not len(mesh.polygons):
+            continue
+        starts = np.empty(len(mesh.polygons), dtype=np.int64)
+        totals = np.empty(len(mesh.polygons), dtype=np.int64)
+        mesh.polygons.foreach_get("loop_start", starts)
+        mesh.polygons.foreach_get("loop_total", totals)
+        size = bound_image_size(obj)
+        for uv_layer in mesh.uv_layers:
+            segment_objects.append(index)
+            segment_layers.append(uv_layer)
+            loop_starts.append(starts)
+            loop_totals.append(totals)
+            image_sizes.append(size)
+
+    if not segment_objects:
+        return masks
+
+    segment_loops = np.fromiter((len(layer.data) for layer in segment_layers), dtype=np.int64,
+                                count=len(segment_layers))
+    segment_offsets = np.cumsum(segment_loops) - segment_loops
+    uvs = np.empty(int(segment_loops.sum()) * 2, dtype=np.float32)
+    for layer, offset, count in zip(segment_layers, segment_offsets.tolist(), segment_loops.tolist()):
+        layer.data.foreach_get("uv", uvs[offset * 2:(offset + count) * 2])
+    uvs = uvs.reshape(-1, 2)
+    segment_masks = np.zeros(len(segment_objects), dtype=np.int8)
+
+    # Rango [0, 1]: una reducción min/max por segmento.
+    minimum = np.minimum.reduceat(uvs, segment_offsets, axis=0).min(axis=1)
+    maximum = np.maximum.reduceat(uvs, segment_offsets, axis=0).max(axis=1)
+    segment_masks[(minimum < 0) | (maximum > 1)] |= UV_OUT_OF_RANGE
+
+    # Rejilla de texels de la imagen asignada (los segmentos sin imagen se omiten).
+    sizes = np.array(image_sizes, dtype=np.float64)
+    loop_sizes = np.repeat(sizes, segment_loops, axis=0)
+    texels = uvs * loop_sizes
+    off_grid = (np.abs(texels - np.round(texels)) > TEXEL_TOLERANCE).any(axis=1) & (loop_sizes > 0).all(axis=1)
+    segment_owner = np.repeat(np.arange(len(segment_objects)), segment_loops)
+    segment_masks[np.bincount(segment_owner, weights=off_grid, minlength=len(segment_objects)) > 0] |= UV_OFF_TEXEL_GRID
+
+    # Área de cada cara en espacio UV (fórmula del área de Gauss).
+    face_starts = np.concatenate([starts + offset for starts, offset in zip(loop_starts, segment_offsets.tolist())])
+    face_totals = np.concatenate(loop_totals)
+    first_corner = np.cumsum(face_totals) - face_totals
+    corner = np.arange(int(face_totals.sum())) - np.repeat(first_corner, face_totals)
+    repeated_totals = np.repeat(face_totals, face_totals)
+    current = np.repeat(face_starts, face_totals) + corner
+    following = np.repeat(face_starts, face_totals) + (corner + 1) % repeated_totals
+    cross = uvs[current, 0] * uvs[following, 1] - uvs[following, 0] * uvs[current, 1]
+    areas = np.abs(np.add.reduceat(cross.astype(np.float64), first_corner)) / 2
+    face_segment = np.repeat(np.arange(len(segment_objects)), [len(totals) for totals in loop_totals])
+    zero_area = np.bincount(face_segment, weights=areas < MIN_UV_AREA, minlength=len(segment_objects)) > 0
+    segment_masks[zero_area] |= UV_ZERO_AREA
+
+    np.bitwise_or.at(masks, np.array(segment_objects), segment_masks)
+    return masks
+
+
+def scene_uv_checks(scene):
+    """Máscara de problemas de UV que invalidan un objeto según las opciones de la escena."""
+    checks = UV_OUT_OF_RANGE
+    if scene.check_uv_texel_grid:
+        checks |= UV_OFF_TEXEL_GRID
+    if scene.check_uv_area:
+        checks |= UV_ZERO_AREA
+    return checks
+
+
+def validate_meshes(mesh_objects):
+    """Devuelve (códigos, topología_ok, problemas_uv) por objeto usando la caché.
+
+    Solo se recalculan las mallas marcadas como sucias o cuya huella cambió, por lo que
+    el coste es proporcional a lo modificado y no al tamaño de la escena.
+    """
+    # La máscara de rejilla de texels depende de la imagen del material, que no marca
+    # la malla como sucia: forma parte de la clave.
+    keys = [(obj.data.session_uid, bound_image_size(obj)) for obj in mesh_objects]
+    stale = {}
+    for obj, key in zip(mesh_objects, keys):
+        mesh = obj.data
+        entry = validation_cache.get(key)
+        if entry is None or key[0] in dirty_meshes or entry[0] != mesh_fingerprint(mesh):
+            stale[key] = obj
+
+    if stale:
+        stale_objects = list(stale.values())
+        codes = classify_objects(stale_objects)
+        topology_ok = validate_topology(stale_objects, codes)
+        uv_problems = check_uvs(stale_objects)
+        for key, obj, code, topology, uv_mask in zip(stale, stale_objects, codes.tolist(), topology_ok.tolist(),
+                                                     uv_problems.tolist()):
+            validation_cache[key] = (mesh_fingerprint(obj.data), code, topology, uv_mask)
+        # Las entradas de la misma malla con una imagen que ya no usa ningún objeto quedan
+        # obsoletas; las que siguen en ``keys`` son válidas (la malla no estaba sucia)
+        refreshed = {key[0] for key in stale}
+        current = set(keys)
+        for key in [key for key in validation_cache if key[0] in refreshed and key not in current]:
+            del validation_cache[key]
+        dirty_meshes.difference_update(refreshed)
+
+    entries = [validation_cache[key] for key in keys]
+    codes = np.fromiter((entry[1] for entry in entries), dtype=np.int8, count=len(entries))
+    topology_ok = np.fromiter((entry[2] for entry in entries), dtype=bool, count=len(entries))
+    uv_problems = np.fromiter((entry[3] for entry in entries), dtype=np.int8, count=len(entries))
+    return codes, topology_ok, uv_problems
+
+
+def find_invalid_objects(objects, check_topology=True, uv_checks=UV_OUT_OF_RANGE):
+    """Devuelve una lista de (objeto, geometría_inválida, uvs_inválidas) para ``objects``.
+
+    Con ``check_topology`` también se marcan los bloques con los conteos correctos pero
+    con una conectividad rota. ``uv_checks`` indica qué problemas ``UV_*`` invalidan las UVs.
+    """
+    mesh_objects = [obj for obj in objects if obj.type == 'MESH']
+    codes, topology_ok, uv_problems = validate_meshes(mesh_objects)
+    uvs_invalid = (uv_problems & uv_checks) != 0
+
+    # Clase esperada según la clasificación guardada por 'Find'; sin clase no hay bloque válido.
+    expected = np.fromiter(
+        (CLASS_CODES.get(obj.block_class, -1) for obj in mesh_objects),
+        dtype=np.int8, count=len(mesh_objects))
+    geometry_invalid = codes != expected
+    if check_topology:
+        geometry_invalid |= ~topology_ok
+    mesh_results = {
+        obj: (bool(geometry), bool(uv_invalid))
+        for obj, geometry, uv_invalid in zip(mesh_objects, geometry_invalid.tolist(), uvs_invalid.tolist())
+    }
+
+    # Si no es MESH, se marca como geometría inválida.
+    return [(obj, *mesh_results.get(obj, (True, False))) for obj in objects]
+
+
+def refresh_invalid_count():
+    """Timer de un solo disparo que revalida lo sucio y actualiza el contador del panel."""
+    global invalid_block_count
+    scene = bpy.context.scene
+    if scene is None or not scene.find_executed:
+        return None
+
+    # Los mismos objetos que marca Find Invalid Geometry, incluida la cuarentena
+    results = find_invalid_objects(list(bpy.data.objects), scene.check_topology, scene_uv_checks(scene))
+    invalid_block_count = sum(1 for _, geometry_invalid, uvs_invalid in results if geometry_invalid or uvs_invalid)
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return None
+
+
+def schedule_invalid_count_refresh():
+    """Agrupa varias actualizaciones seguidas en un solo refresco del contador."""
+    if not bpy.app.timers.is_registered(refresh_invalid_count):
+        bpy.app.timers.register(refresh_invalid_count, first_interval=0.25)
+
+
+def is_mesh_edit(update):
+    """True si un update del depsgraph viene de editar los datos de una malla.
+
+    Los updates de geometría a nivel de objeto también llegan cuando solo se reevalúan
+    sus modificadores (p. ej. la semilla del grupo de nodos del wiggle en cada tick),
+    así que solo cuenta el ID de la malla.
+    """
+    return update.is_updated_geometry and isinstance(update.id, bpy.types.Mesh)
+
+
+def is_mesh_edit_or_transform(update):
+    """True si el update edita una malla o mueve un objeto."""
+    return is_mesh_edit(update) or (update.is_updated_transform and isinstance(update.id, bpy.types.Object))
+
+
+@bpy.app.handlers.persistent
+def mark_dirty_meshes(scene, depsgraph):
+    """Marca como sucias solo las mallas que el depsgraph reporta como editadas."""
+    changed = False
+    for update in depsgraph.updates:
+        if is_mesh_edit(update):
+            dirty_meshes.add(update.id.original.session_uid)
+            changed = True
+    # Otra imagen en el material cambia la rejilla de texels (la caché lo detecta por la clave)
+    if depsgraph.id_type_updated('MATERIAL') or depsgraph.id_type_updated('IMAGE'):
+        material_image_sizes.clear()
+        changed = True
+
+    if changed and scene.find_executed:
+        schedule_invalid_count_refresh()
+
+
+@bpy.app.handlers.persistent
+def clear_validation_cache(dummy):
+    """Vacía la caché al cargar otro archivo."""
+    global invalid_block_count
+    validation_cache.clear()
+    dirty_meshes.clear()
+    material_image_sizes.clear()
+    invalid_block_count = None
+
+
+# Claves del índice de resultados
+RESULT_KEYS = ('TRIBLOCK', 'QUADBLOCK', 'INVALID_GEOMETRY', 'INVALID_UVS', 'DUPLICATE')
+# Sufijos que usaban versiones anteriores para guardar los resultados en el nombre
+LEGACY_SUFFIXES = ("_invalid_geometry", "_invalid_uvs", "_quadblock", "_triblock")
+# Columnas del informe de validación
+REPORT_FIELDS = ("name", "type", "block_class", "invalid_geometry", "invalid_uvs", "duplicate_block")
+
+# Índice en memoria: clave -> {session_uid del objeto: nombre}. La fuente de verdad son las
+# propiedades de cada objeto; el nombre solo sirve para buscarlo y se comprueba con el
+# session_uid, así que un renombre o un nombre reutilizado provocan una reconstrucción.
+result_index = {key: {} for key in RESULT_KEYS}
+result_index_stale = True
+# session_uid de todos los objetos que conoce el índice, marcados o no. Si no coincide con
+# el número de objetos del archivo, se creó uno sin pasar por el índice (p. ej. una copia
+# con ``obj.copy()`` sin enlazar) o se borró alguno, y el índice se reconstruye.
+indexed_objects = set()
+
+
+def object_result_keys(obj):
+    """Claves del índice a las que pertenece un objeto según sus propiedades."""
+    keys = []
+    if obj.block_class != 'NONE':
+        keys.append(obj.block_class)
+    if obj.invalid_geometry:
+        keys.append('INVALID_GEOMETRY')
+    if obj.invalid_uvs:
+        keys.append('INVALID_UVS')
+    if obj.duplicate_block:
+        keys.append('DUPLICATE')
+    return keys
+
+
+def rebuild_result_index():
+    """Reconstruye el índice a partir de las propiedades guardadas en los objetos."""
+    global result_index_stale
+    for entries in result_index.values():
+        entries.clear()
+    indexed_objects.clear()
+    for obj in bpy.data.objects:
+        indexed_objects.add(obj.session_uid)
+        for key in object_result_keys(obj):
+            result_index[key][obj.session_uid] = obj.name
+    result_index_stale = False
+
+
+def index_object(obj):
+    """Actualiza la entrada de un objeto en el índice tras cambiar sus propiedades."""
+    for entries in result_index.values():
+        entries.pop(obj.session_uid, None)
+    indexed_objects.add(obj.session_uid)
+    for key in object_result_keys(obj):
+        result_index[key][obj.session_uid] = obj.name
+
+
+def resolve_index_entries(key):
+    """Objetos de una clave del índice, o None si alguno se borró o cambió de nombre."""
+    objects = []
+    for session_uid, name in result_index[key].items():
+        obj = bpy.data.objects.get(name)
+        if obj is None or obj.session_uid != session_uid:
+            return None
+        objects.append(obj)
+    return objects
+
+
+def objects_in(key):
+    """Devuelve los objetos guardados bajo una clave del índice ('QUADBLOCK', 'INVALID_UVS', ...)."""
+    if result_index_stale or len(bpy.data.objects) != len(indexed_objects):
+        rebuild_result_index()
+    objects = resolve_index_entries(key)
+    if objects is None:
+        rebuild_result_index()
+        objects = resolve_index_entries(key)
+    return objects
+
+
+def invalid_objects():
+    """Objetos marcados con geometría o UVs inválidas o como bloques duplicados."""
+    marked = objects_in('INVALID_GEOMETRY') + objects_in('INVALID_UVS') + objects_in('DUPLICATE')
+    return list({obj: None for obj in marked})
+
+
+def set_block_result(obj, block_class=None, invalid_geometry=None, invalid_uvs=None, duplicate_block=None):
+    """Guarda los resultados en las propiedades del objeto, escribiendo solo lo que cambia."""
+    if block_class is not None and obj.block_class != block_class:
+        obj.block_class = block_class
+    if invalid_geometry is not None and obj.invalid_geometry != invalid_geometry:
+        obj.invalid_geometry = invalid_geometry
+    if invalid_uvs is not None and obj.invalid_uvs != invalid_uvs:
+        obj.invalid_uvs = invalid_uvs
+    if duplicate_block is not None and obj.duplicate_block != duplicate_block:
+        obj.duplicate_block = duplicate_block
+    index_object(obj)
+
+
+@bpy.app.handlers.persistent
+def index_new_objects(scene, depsgraph):
+    """Añade al índice los objetos nuevos (duplicados, copias enlazadas a la escena).
+
+    Las copias heredan las propiedades de resultados del original; solo se miran los
+    objetos del update que el índice aún no conoce. Si después los conteos no cuadran
+    (se borraron objetos), el índice queda para reconstruir en la próxima consulta.
+    """
+    if result_index_stale:
+        return
+    if depsgraph.id_type_updated('OBJECT'):
+        for update in depsgraph.updates:
+            obj = update.id.original
+            if isinstance(obj, bpy.types.Object) and obj.session_uid not in indexed_objects:
+                index_object(obj)
+    if len(bpy.data.objects) != len(indexed_objects):
+        mark_result_index_stale()
+
+
+def mark_result_index_stale(*args):
+    """Marca el índice para reconstruirlo en la próxima consulta."""
+    global result_index_stale
+    result_index_stale = True
+
+
+@bpy.app.handlers.persistent
+def reset_result_index(*args):
+    """Tras cargar un archivo o deshacer, el índice se reconstruye desde las propiedades."""
+    mark_result_index_stale()
+
+
+def validation_report_rows():
+    """Filas del informe de validación, una por objeto."""
+    return [{field: getattr(obj, field) for field in REPORT_FIELDS} for obj in bpy.data.objects]
+
+
+def gather_local_coordinates(objects):
+    """Lee todos los vértices de ``objects`` con foreach_get en un único array.
+
+    Devuelve las coordenadas locales (N, 3) en float32 y el número de vértices de cada objeto.
+    """
+    counts = np.fromiter((len(obj.data.vertices) for obj in objects), dtype=np.int64, count=len(objects))
+    coords = np.empty(int(counts.sum()) * 3, dtype=np.float32)
+    offset = 0
+    for obj, count in zip(objects, counts.tolist()):
+        if count:
+            obj.data.vertices.foreach_get("co", coords[offset * 3:(offset + count) * 3])
+            offset += count
+    return coords.reshape(-1, 3), counts
+
+
+def transform_coordinates(coords, counts, matrices):
+    """Aplica en bloque una matriz 4x4 por objeto a sus ``counts`` vértices consecutivos."""
+    if not len(coords):
+        return coords.astype(np.float64)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    return np.einsum('nij,nj->ni', matrices[owner, :3, :3], coords.astype(np.float64)) + matrices[owner, :3, 3]
+
+
+def world_matrices(objects):
+    """matrix_world de todos los objetos como un array (n, 4, 4)."""
+    return np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+
+
+def gather_world_coordinates(objects):
+    """Lee todos los vértices de ``objects`` y aplica matrix_world en bloque.
+
+    Devuelve las coordenadas de mundo (N, 3) y el número de vértices de cada objeto.
+    """
+    coords, counts = gather_local_coordinates(objects)
+    return transform_coordinates(coords, counts, world_matrices(objects)), counts
+
+
+# Distancia por debajo de la cual dos bloques se consideran duplicados exactos
+EXACT_DUPLICATE_DISTANCE = 1e-6
+# La celda propia más 13 vecinas: cada par de celdas vecinas se visita una sola vez
+HALF_NEIGHBOURHOOD = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+                      if (dx, dy, dz) >= (0, 0, 0)]
+
+
+def grid_neighbour_pairs(points, cell_size):
+    """Pares (i, j), i < j, de puntos que caen en la misma celda o en celdas vecinas.
+
+    Los puntos se agrupan en una rejilla uniforme. Las búsquedas se hacen por celda
+    ocupada (no por punto) y solo hacia la mitad de las vecinas, porque la otra mitad
+    produce los mismos pares; el coste es casi lineal en el número de puntos.
+    """
+    count = len(points)
+    if count < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Celdas lo bastante grandes para que la clave empaquetada quepa en int64
+    span = float((points.max(axis=0) - points.min(axis=0)).max())
+    cell_size = max(cell_size, span / 1e6, 1e-9)
+    cells = np.floor((points - points.min(axis=0)) / cell_size).astype(np.int64) + 1
+    dims = cells.max(axis=0) + 2
+
+    def pack(c):
+        return (c[..., 0] * dims[1] + c[..., 1]) * dims[2] + c[..., 2]
+
+    keys = pack(cells)
+    order = np.argsort(keys, kind='stable')
+    cell_keys, cell_start, cell_count = np.unique(keys[order], return_index=True, return_counts=True)
+    occupied = cells[order[cell_start]]
+
+    first, second = [], []
+    for dx, dy, dz in HALF_NEIGHBOURHOOD:
+        neighbour = pack(occupied + np.array([dx, dy, dz]))
+        found = np.minimum(np.searchsorted(cell_keys, neighbour), len(cell_keys) - 1)
+        source = np.flatnonzero(cell_keys[found] == neighbour)
+        target = found[source]
+        # Todas las combinaciones de puntos entre las dos celdas
+        pair_count = cell_count[source] * cell_count[target]
+        total = int(pair_count.sum())
+        if not total:
+            continue
+        pair = np.repeat(np.arange(len(source)), pair_count)
+        step = np.arange(total) - np.repeat(np.cumsum(pair_count) - pair_count, pair_count)
+        width = cell_count[target][pair]
+        a = order[cell_start[source][pair] + step // width]
+        b = order[cell_start[target][pair] + step % width]
+        keep = a < b if (dx, dy, dz) == (0, 0, 0) else a != b
+        first.append(np.minimum(a[keep], b[keep]))
+        second.append(np.maximum(a[keep], b[keep]))
+
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def connected_components(count, first, second):
+    """Etiqueta las componentes conexas de un grafo dado como arrays de aristas.
+
+    Cada nodo queda etiquetado con el menor índice de su componente, propagando la
+    etiqueta mínima por las aristas y saltando punteros, todo en NumPy.
+    """
+    labels = np.arange(count)
+    if not len(first):
+        return labels
+    while True:
+        lowest = np.minimum(labels[first], labels[second])
+        np.minimum.at(labels, first, lowest)
+        np.minimum.at(labels, second, lowest)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+        if np.array_equal(labels[first], labels[second]):
+            return labels
+
+
+def find_duplicate_blocks(objects, tolerance):
+    """Detecta bloques apilados: duplicados exactos y solapes casi coincidentes.
+
+    Agrupa los bloques por clase (mismo número de vértices), los indexa por su centroide
+    en una rejilla uniforme y solo compara cada bloque con los de celdas vecinas. Dos
+    bloques se solapan si cada vértice de uno tiene un vértice del otro a menos de
+    ``tolerance``. Los solapes forman un grafo; de cada componente conexa se conserva
+    solo el primer bloque (por nombre), así que el resultado no depende del orden de
+    los pares. Un bloque eliminado es duplicado exacto si alguno de sus solapes lo es.
+
+    Devuelve (duplicados_exactos, solapes), listas de objetos a eliminar.
+    """
+    objects = sorted(objects, key=lambda obj: obj.name)
+    codes = classify_objects(objects)
+    exact, overlapping = [], []
+
+    for code in (BLOCK_TRIBLOCK, BLOCK_QUADBLOCK):
+        blocks = [objects[i] for i in np.flatnonzero(codes == code).tolist()]
+        if len(blocks) < 2:
+            continue
+
+        world, counts = gather_world_coordinates(blocks)
+        corners = world.reshape(len(blocks), int(counts[0]), 3)
+        centroids = corners.mean(axis=1)
+
+        first, second = grid_neighbour_pairs(centroids, tolerance)
+        if not len(first):
+            continue
+        close = np.linalg.norm(centroids[first] - centroids[second], axis=1) <= tolerance
+        first, second = first[close], second[close]
+
+        # Distancia de Hausdorff entre los conjuntos de vértices de cada par candidato
+        distances = np.linalg.norm(corners[first][:, :, None, :] - corners[second][:, None, :, :], axis=3)
+        hausdorff = np.maximum(distances.min(axis=2).max(axis=1), distances.min(axis=1).max(axis=1))
+        overlap = hausdorff <= tolerance
+
+        first, second, hausdorff = first[overlap], second[overlap], hausdorff[overlap]
+        labels = connected_components(len(blocks), first, second)
+        closest = np.full(len(blocks), np.inf)
+        np.minimum.at(closest, first, hausdorff)
+        np.minimum.at(closest, second, hausdorff)
+        for index in np.flatnonzero(labels != np.arange(len(blocks))).tolist():
+            (exact if closest[index] <= EXACT_DUPLICATE_DISTANCE else overlapping).append(blocks[index])
+
+    return exact, overlapping
+
+
+# Colección oculta donde se revisan los objetos inválidos antes de borrarlos
+QUARANTINE_COLLECTION = "Invalid"
+# Propiedad con las colecciones originales de un objeto en cuarentena
+QUARANTINE_SOURCE_KEY = "quarantine_collections"
+
+
+def quarantine_collection(context, create=False):
+    """Devuelve la colección de cuarentena (oculta), creándola si se pide."""
+    collection = bpy.data.collections.get(QUARANTINE_COLLECTION)
+    if collection is None and create:
+        collection = bpy.data.collections.new(QUARANTINE_COLLECTION)
+        collection.hide_viewport = True
+        collection.hide_render = True
+    if collection is not None and create and collection.name not in context.scene.collection.children:
+        context.scene.collection.children.link(collection)
+    return collection
+
+
+def quarantine_objects(context, objects):
+    """Mueve los objetos a la colección de cuarentena recordando sus colecciones originales."""
+    collection = quarantine_collection(context, create=True)
+    moved = 0
+    for obj in objects:
+        if collection in obj.users_collection:
+            continue
+        obj[QUARANTINE_SOURCE_KEY] = [source.name for source in obj.users_collection]
+        for source in list(obj.users_collection):
+            source.objects.unlink(obj)
+        collection.objects.link(obj)
+        moved += 1
+    return moved
+
+
+def restore_quarantined(context):
+    """Devuelve los objetos en cuarentena a sus colecciones originales."""
+    collection = quarantine_collection(context)
+    if collection is None:
+        return 0
+    objects = list(collection.objects)
+    for obj in objects:
+        targets = [bpy.data.collections.get(name) for name in obj.get(QUARANTINE_SOURCE_KEY, [])]
+        targets = [target for target in targets if target is not None and target != collection]
+        if not targets:
+            targets = [context.scene.collection]
+        collection.objects.unlink(obj)
+        for target in targets:
+            if obj.name not in target.objects:
+                target.objects.link(obj)
+        if QUARANTINE_SOURCE_KEY in obj:
+            del obj[QUARANTINE_SOURCE_KEY]
+    return len(objects)
+
+
+def orphaned_data(objects):
+    """Mallas y materiales que quedarán sin usuarios al borrar ``objects``."""
+    mesh_uses = {}
+    for obj in objects:
+        if obj.type == 'MESH':
+            mesh_uses[obj.data] = mesh_uses.get(obj.data, 0) + 1
+    meshes = [mesh for mesh, uses in mesh_uses.items() if mesh.users == uses and not mesh.use_fake_user]
+
+    material_uses = {}
+    for mesh in meshes:
+        for material in mesh.materials:
+            if material is not None:
+                material_uses[material] = material_uses.get(material, 0) + 1
+    materials = [material for material, uses in material_uses.items()
+                 if material.users == uses and not material.use_fake_user]
+    return meshes + materials
+
+
+def remove_objects(objects):
+    """Borra los objetos y sus datos huérfanos con una sola llamada a batch_remove."""
+    bpy.data.batch_remove(list(objects) + orphaned_data(objects))
 
 
 class OBJECT_OT_FindObjects(bpy.types.Operator):
-    """Find objects and add suffixes based on the selection."""
+    """Find objects and store their block class based on the selection."""
     bl_idname = "geometry.find_objects"
     bl_label = "Find Objects"
 
@@ -40,32 +821,27 @@ class OBJECT_OT_FindObjects(bpy.types.Operator):
         context.scene.find_executed = True  
         find_option = context.scene.find_option
 
-        bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=0)
+        # Sin ventana (modo background) no hay nada que redibujar
+        if not bpy.app.background:
+            bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=0)
         start_time = time.time()
 
         mesh_objects = [obj for obj in bpy.data.objects if obj.type == 'MESH']
+        codes = classify_objects(mesh_objects)
 
-        for obj in mesh_objects:
-            vertex_count = len(obj.data.vertices)
-            edge_count = len(obj.data.edges)
-            face_count = len(obj.data.polygons)
-
-            # Si el objeto contiene algún NGon (cara con más de 4 vértices), se omite.
-            if any(len(poly.vertices) > 4 for poly in obj.data.polygons):
-                continue
-
-            if find_option == 'TRIBLOCK' and vertex_count == 6 and edge_count == 9 and face_count == 4:
-                obj.name = f"{obj.name}_triblock"
-            elif find_option == 'QUADBLOCK' and vertex_count == 9 and edge_count == 12 and face_count == 4:
-                obj.name = f"{obj.name}_quadblock"
+        for index in np.flatnonzero(codes == CLASS_CODES[find_option]).tolist():
+            set_block_result(mesh_objects[index], block_class=find_option)
+        schedule_invalid_count_refresh()
 
         elapsed_time = time.time() - start_time
-        self.report({'INFO'}, f"Find operation completed in {elapsed_time:.2f} seconds.")
+        rate = len(mesh_objects) / elapsed_time if elapsed_time > 0 else float(len(mesh_objects))
+        self.report({'INFO'}, f"Find operation completed in {elapsed_time:.2f} seconds "
+                              f"({len(mesh_objects)} objects, {rate:.0f} objects/s).")
         return {'FINISHED'}
 
 
 class OBJECT_OT_FindInvalidGeometry(bpy.types.Operator):
-    """Mark objects with invalid geometry or UVs by adding appropriate suffixes."""
+    """Mark objects with invalid geometry or UVs."""
     bl_idname = "geometry.find_invalid"
     bl_label = "Find Invalid Geometry"
 
@@ -78,111 +854,231 @@ class OBJECT_OT_FindInvalidGeometry(bpy.types.Operator):
         skip_quadblock = context.scene.skip_quadblock
 
         # Validación previa de que se hayan encontrado al menos un triblock o quadblock (o se hayan marcado como skip)
-        triblock_found = any(obj.name.endswith("_triblock") for obj in bpy.data.objects if obj.type == 'MESH')
-        quadblock_found = any(obj.name.endswith("_quadblock") for obj in bpy.data.objects if obj.type == 'MESH')
+        triblock_found = bool(objects_in('TRIBLOCK'))
+        quadblock_found = bool(objects_in('QUADBLOCK'))
 
         if not ((triblock_found or skip_triblock) and (quadblock_found or skip_quadblock)):
             self.report({'WARNING'}, "Both TRIBLOCK and QUADBLOCK must be found or skipped.")
             return {'CANCELLED'}
 
-        for obj in bpy.data.objects:
-            geometry_invalid = False
-            uvs_invalid = False
+        start_time = time.time()
 
-            # Si no es MESH, se marca como geometría inválida.
-            if obj.type != 'MESH':
-                geometry_invalid = True
-            else:
-                vertex_count = len(obj.data.vertices)
-                edge_count = len(obj.data.edges)
-                face_count = len(obj.data.polygons)
-
-                # Si contiene NGons, se marca como geometría inválida.
-                if any(len(poly.vertices) > 4 for poly in obj.data.polygons):
-                    geometry_invalid = True
-
-                # Validación de geometría según el sufijo asignado.
-                if obj.name.endswith("_triblock"):
-                    if vertex_count != 6 or edge_count != 9 or face_count != 4:
-                        geometry_invalid = True
-                elif obj.name.endswith("_quadblock"):
-                    if vertex_count != 9 or edge_count != 12 or face_count != 4:
-                        geometry_invalid = True
-                else:
-                    # Si no tiene ninguno de los sufijos, se marca como geometría inválida.
-                    geometry_invalid = True
-
-                # Validación de UVs: Si existen capas de UV, se verifica que todas las coordenadas estén en rango [0, 1].
-                if obj.data.uv_layers:
-                    for uv_layer in obj.data.uv_layers:
-                        for uv_data in uv_layer.data:
-                            u, v = uv_data.uv.x, uv_data.uv.y
-                            if u < 0 or u > 1 or v < 0 or v > 1:
-                                uvs_invalid = True
-                                break
-                        if uvs_invalid:
-                            break
-
-            # Añadir sufijos según corresponda
-            if geometry_invalid and "_invalid_geometry" not in obj.name:
-                obj.name = f"{obj.name}_invalid_geometry"
-            if uvs_invalid and "_invalid_uvs" not in obj.name:
-                obj.name = f"{obj.name}_invalid_uvs"
-
-        self.report({'INFO'}, "Invalid geometry/UVs marked.")
+        objects = list(bpy.data.objects)
+        uv_checks = scene_uv_checks(context.scene)
+        results = find_invalid_objects(objects, context.scene.check_topology, uv_checks)
+        for obj, geometry_invalid, uvs_invalid in results:
+            set_block_result(obj, invalid_geometry=geometry_invalid, invalid_uvs=uvs_invalid)
+        schedule_invalid_count_refresh()
+
+        elapsed_time = time.time() - start_time
+        rate = len(objects) / elapsed_time if elapsed_time > 0 else float(len(objects))
+        self.report({'INFO'}, f"Invalid geometry/UVs marked ({len(invalid_objects())} invalid, "
+                              f"{len(objects)} objects, {rate:.0f} objects/s).")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_FindDuplicates(bpy.types.Operator):
+    """Mark stacked duplicate and overlapping blocks so they can be removed with Remove Invalid Data."""
+    bl_idname = "geometry.find_duplicates"
+    bl_label = "Find Duplicates"
+
+    def execute(self, context):
+        start_time = time.time()
+
+        mesh_objects = [obj for obj in context.scene.objects if obj.type == 'MESH']
+        exact, overlapping = find_duplicate_blocks(mesh_objects, context.scene.duplicate_tolerance)
+
+        duplicates = set(exact) | set(overlapping)
+        for obj in mesh_objects:
+            set_block_result(obj, duplicate_block=obj in duplicates)
+
+        elapsed_time = time.time() - start_time
+        self.report({'INFO'}, f"Found {len(exact)} exact duplicates and {len(overlapping)} overlapping blocks "
+                              f"in {elapsed_time:.2f} seconds.")
         return {'FINISHED'}
 
 
 class OBJECT_OT_ResetName(bpy.types.Operator):
-    """Remove '_invalid_geometry', '_invalid_uvs', '_quadblock', and '_triblock' suffixes from all objects."""
+    """Clear the stored validation results and remove legacy suffixes from all objects."""
     bl_idname = "geometry.reset_name"
-    bl_label = "Reset Name"
+    bl_label = "Reset Results"
 
     def execute(self, context):
         for obj in bpy.data.objects:
-            for suffix in ["_invalid_geometry", "_invalid_uvs", "_quadblock", "_triblock"]:
+            set_block_result(obj, block_class='NONE', invalid_geometry=False, invalid_uvs=False, duplicate_block=False)
+            # Archivos validados con versiones anteriores guardaban el resultado en el nombre.
+            for suffix in LEGACY_SUFFIXES:
                 if obj.name.endswith(suffix):
                     obj.name = obj.name.replace(suffix, "")
-        self.report({'INFO'}, "Names reset.")
+        mark_result_index_stale()
+        schedule_invalid_count_refresh()
+        self.report({'INFO'}, "Results reset.")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_QuarantineInvalidData(bpy.types.Operator):
+    """Move objects marked as invalid into the hidden 'Invalid' collection for review."""
+    bl_idname = "geometry.quarantine_invalid_data"
+    bl_label = "Quarantine Invalid Data"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        moved = quarantine_objects(context, invalid_objects())
+        self.report({'INFO'}, f"Moved {moved} invalid objects to '{QUARANTINE_COLLECTION}'.")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_RestoreQuarantined(bpy.types.Operator):
+    """Move the quarantined objects back to their original collections."""
+    bl_idname = "geometry.restore_quarantined"
+    bl_label = "Restore Quarantined"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        restored = restore_quarantined(context)
+        self.report({'INFO'}, f"Restored {restored} objects.")
         return {'FINISHED'}
 
 
 class OBJECT_OT_RemoveInvalidData(bpy.types.Operator):
-    """Delete objects marked as invalid by geometry or UVs."""
+    """Delete the quarantined objects (or, if none, the objects marked as invalid) and their orphaned data."""
     bl_idname = "geometry.remove_invalid_data"
     bl_label = "Remove Invalid Data"
+    bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        # Se buscan objetos que tengan los sufijos de geometría o UVs inválidas.
-        invalid_objects = [
-            obj for obj in bpy.data.objects
-            if obj.name.endswith("_invalid_geometry") or obj.name.endswith("_invalid_uvs")
-        ]
-        count = len(invalid_objects)
-        for obj in invalid_objects:
-            bpy.data.objects.remove(obj, do_unlink=True)
+        collection = quarantine_collection(context)
+        if collection is not None and collection.objects:
+            invalid = list(collection.objects)
+        else:
+            invalid = invalid_objects()
+        count = len(invalid)
+        remove_objects(invalid)
+        if collection is not None and not collection.objects and not collection.children:
+            bpy.data.collections.remove(collection)
+        mark_result_index_stale()
+        schedule_invalid_count_refresh()
         self.report({'INFO'}, f"Removed {count} invalid objects.")
         return {'FINISHED'}
 
+    def invoke(self, context, event):
+        return context.window_manager.invoke_confirm(self, event)
+
+
+class OBJECT_OT_ExportValidationReport(bpy.types.Operator):
+    """Export the stored validation results as JSON or CSV."""
+    bl_idname = "geometry.export_report"
+    bl_label = "Export Validation Report"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.json;*.csv", options={'HIDDEN'})
+
+    def execute(self, context):
+        rows = validation_report_rows()
+        try:
+            if self.filepath.lower().endswith(".csv"):
+                with open(self.filepath, "w", encoding="utf-8", newline="") as file:
+                    writer = csv.DictWriter(file, fieldnames=list(REPORT_FIELDS))
+                    writer.writeheader()
+                    writer.writerows(rows)
+            else:
+                summary = {key.lower(): len(objects_in(key)) for key in RESULT_KEYS}
+                summary["objects"] = len(rows)
+                with open(self.filepath, "w", encoding="utf-8") as file:
+                    json.dump({"summary": summary, "objects": rows}, file, indent=4)
+        except OSError as e:
+            self.report({'ERROR'}, f"Could not write report: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Validation report exported to {self.filepath}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "validation_report.json"
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
 
 def register():
     bpy.types.Scene.find_option = bpy.props.EnumProperty(
         name="Find Option",
         items=[
-            ('TRIBLOCK', "Triblock", "Add suffix _triblock to objects with 6 vertices, 9 edges, and 4 faces"),
-            ('QUADBLOCK', "Quadblock", "Add suffix _quadblock to objects with 9 vertices, 12 edges, and 4 faces"),
+            ('TRIBLOCK', "Triblock", "Mark objects with 6 vertices, 9 edges, and 4 faces as triblocks"),
+            ('QUADBLOCK', "Quadblock", "Mark objects with 9 vertices, 12 edges, and 4 faces as quadblocks"),
         ],
         default='TRIBLOCK'
     )
     bpy.types.Scene.find_executed = bpy.props.BoolProperty(default=False)
     bpy.types.Scene.skip_triblock = bpy.props.BoolProperty(name="No Triblock", default=False)
     bpy.types.Scene.skip_quadblock = bpy.props.BoolProperty(name="No Quadblock", default=False)
+    bpy.types.Scene.check_uv_area = bpy.props.BoolProperty(
+        name="Check UV Area",
+        description="Mark objects with faces that have zero area in UV space",
+        default=False
+    )
+    bpy.types.Scene.check_uv_texel_grid = bpy.props.BoolProperty(
+        name="Check Texel Grid",
+        description="Mark objects whose UVs do not fall on the texel grid of their image",
+        default=False
+    )
+    bpy.types.Scene.duplicate_tolerance = bpy.props.FloatProperty(
+        name="Duplicate Tolerance",
+        description="Maximum vertex distance for two blocks to be considered overlapping",
+        default=0.01,
+        min=0.0,
+        precision=4
+    )
+    bpy.types.Scene.check_topology = bpy.props.BoolProperty(
+        name="Check Topology",
+        description="Also validate grid connectivity, winding and degenerate faces of each block",
+        default=True
+    )
+
+    # Resultados de validación por objeto (sustituyen a los sufijos en el nombre)
+    bpy.types.Object.block_class = bpy.props.EnumProperty(
+        name="Block Class",
+        items=[
+            ('NONE', "None", "Not classified"),
+            ('TRIBLOCK', "Triblock", "Classified as triblock"),
+            ('QUADBLOCK', "Quadblock", "Classified as quadblock"),
+        ],
+        default='NONE'
+    )
+    bpy.types.Object.invalid_geometry = bpy.props.BoolProperty(name="Invalid Geometry", default=False)
+    bpy.types.Object.invalid_uvs = bpy.props.BoolProperty(name="Invalid UVs", default=False)
+    bpy.types.Object.duplicate_block = bpy.props.BoolProperty(name="Duplicate Block", default=False)
 
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    # Handlers de la caché de validación incremental
+    if mark_dirty_meshes not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(mark_dirty_meshes)
+    if clear_validation_cache not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_validation_cache)
+
+    # Handlers del índice de resultados
+    if index_new_objects not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(index_new_objects)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if reset_result_index not in handlers:
+            handlers.append(reset_result_index)
+
 
 def unregister():
+    if mark_dirty_meshes in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(mark_dirty_meshes)
+    if clear_validation_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_validation_cache)
+    if bpy.app.timers.is_registered(refresh_invalid_count):
+        bpy.app.timers.unregister(refresh_invalid_count)
+    if index_new_objects in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(index_new_objects)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if reset_result_index in handlers:
+            handlers.remove(reset_result_index)
+
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
@@ -190,14 +1086,26 @@ def unregister():
     del bpy.types.Scene.find_executed
     del bpy.types.Scene.skip_triblock
     del bpy.types.Scene.skip_quadblock
+    del bpy.types.Scene.check_topology
+    del bpy.types.Scene.duplicate_tolerance
+    del bpy.types.Scene.check_uv_area
+    del bpy.types.Scene.check_uv_texel_grid
+    del bpy.types.Object.block_class
+    del bpy.types.Object.invalid_geometry
+    del bpy.types.Object.invalid_uvs
+    del bpy.types.Object.duplicate_block
 
 
 classes = [
     GeometryToolsPanel,
     OBJECT_OT_FindObjects,
     OBJECT_OT_FindInvalidGeometry,
+    OBJECT_OT_FindDuplicates,
     OBJECT_OT_ResetName,
-    OBJECT_OT_RemoveInvalidData
+    OBJECT_OT_QuarantineInvalidData,
+    OBJECT_OT_RestoreQuarantined,
+    OBJECT_OT_RemoveInvalidData,
+    OBJECT_OT_ExportValidationReport
 ]
 
 if __name__ == "__main__":
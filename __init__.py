@@ -26,6 +26,7 @@ from . import relative_track
 from . import apply_settings
 from . import vertex_lighting
 from . import render_menu
+from . import geometry_snapshots
 from . import psx_wiggle
 from . import Find_invalid_data
 from . import basic_uv_tools
@@ -42,6 +43,9 @@ from . import import_reference
 from . import atlas
 from . import set_uv_frames
 from . import load_sequence
+from . import track_budget
+from . import spatial_index
+from . import crack_detector
 
 def register():
     # Registrar todos los módulos
@@ -61,6 +65,7 @@ def register():
         apply_settings,
         vertex_lighting,
         render_menu,
+        geometry_snapshots,
         psx_wiggle,
         Find_invalid_data,
         basic_uv_tools,
@@ -77,6 +82,9 @@ def register():
         atlas,
         set_uv_frames,
         load_sequence,
+        track_budget,
+        spatial_index,
+        crack_detector,
     ]
     
     for module in modules:
@@ -105,6 +113,7 @@ def unregister():
         apply_settings,
         vertex_lighting,
         render_menu,
+        geometry_snapshots,
         psx_wiggle,
         Find_invalid_data,
         basic_uv_tools,
@@ -120,7 +129,10 @@ def unregister():
         import_reference,
         atlas,
         set_uv_frames,
-        load_sequence
+        load_sequence,
+        track_budget,
+        spatial_index,
+        crack_detector
     ]
     
     for module in modules:
@@ -1,5 +1,7 @@
 import bpy
 
+from .psx_wiggle import WIGGLE_MODIFIER
+
 # Panel de la UI en la barra lateral
 class ApplyPanel(bpy.types.Panel):
     bl_label = "Apply"
@@ -64,12 +66,13 @@ class OBJECT_OT_apply_all_modifiers(bpy.types.Operator):
 
         for obj in mesh_objects:
             bpy.context.view_layer.objects.active = obj  # Establecer como activo
-            for mod in obj.modifiers:
+            # El modificador de la vista previa del wiggle nunca se aplica a la malla
+            for name in [mod.name for mod in obj.modifiers if mod.name != WIGGLE_MODIFIER]:
                 try:
-                    bpy.ops.object.modifier_apply(modifier=mod.name)
+                    bpy.ops.object.modifier_apply(modifier=name)
                     count += 1
                 except RuntimeError:
-                    self.report({'WARNING'}, f"No se pudo aplicar el modificador '{mod.name}' en '{obj.name}'")
+                    self.report({'WARNING'}, f"No se pudo aplicar el modificador '{name}' en '{obj.name}'")
 
         self.report({'INFO'}, f"Se aplicaron {count} modificadores a los objetos visibles.")
         return {'FINISHED'}
@@ -0,0 +1,183 @@
+"""Headless batch validator for RaceTrackBuilder tracks.
+
+Runs the Find / Find Invalid Geometry checks of ``Find_invalid_data`` on a list of
+.blend files without opening them by hand. Every file is validated by its own
+background Blender process; the processes run in a pool (one per core by default)
+and their results are merged into a single JSON report.
+
+Usage (from a regular Python or from Blender's bundled Python):
+
+    python batch_validate.py --blender /path/to/blender --output report.json tracks/*.blend
+
+The files are never saved, so they are not modified. Exit code is 0 when every file
+is valid, 1 when invalid data was found and 2 when a file could not be validated.
+Faces with zero UV area are reported under ``uvs_zero_area``; like the Check UV Area
+option of the panel, ``--check-uv-area`` also counts them as invalid UVs.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+WORKER_FLAG = "--worker"
+
+
+# -------------------------------
+# Worker (runs inside background Blender)
+# -------------------------------
+def load_validation_module():
+    """Loads Find_invalid_data.py on its own, without registering the whole addon."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(
+        "rtb_find_invalid_data", os.path.join(ADDON_DIR, "Find_invalid_data.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def validate_open_file(check_uv_area=False):
+    """Validates the currently open .blend as if Find had been run for both block types."""
+    import bpy
+
+    validation = load_validation_module()
+    start_time = time.time()
+
+    objects = list(bpy.data.objects)
+    mesh_objects = [obj for obj in objects if obj.type == 'MESH']
+    codes, topology_ok, uv_problems = validation.validate_meshes(mesh_objects)
+    geometry_invalid = (codes == validation.BLOCK_INVALID) | ~topology_ok
+    uv_checks = validation.UV_OUT_OF_RANGE | (validation.UV_ZERO_AREA if check_uv_area else 0)
+    uvs_invalid = (uv_problems & uv_checks) != 0
+    off_texel_grid = (uv_problems & validation.UV_OFF_TEXEL_GRID) != 0
+    zero_area = (uv_problems & validation.UV_ZERO_AREA) != 0
+
+    invalid_geometry = [obj.name for obj in objects if obj.type != 'MESH']
+    invalid_geometry += [obj.name for obj, flag in zip(mesh_objects, geometry_invalid.tolist()) if flag]
+    invalid_uvs = [obj.name for obj, flag in zip(mesh_objects, uvs_invalid.tolist()) if flag]
+    uvs_off_texel_grid = [obj.name for obj, flag in zip(mesh_objects, off_texel_grid.tolist()) if flag]
+    uvs_zero_area = [obj.name for obj, flag in zip(mesh_objects, zero_area.tolist()) if flag]
+
+    return {
+        "file": bpy.data.filepath,
+        "objects": len(objects),
+        "triblocks": int((codes == validation.BLOCK_TRIBLOCK).sum()),
+        "quadblocks": int((codes == validation.BLOCK_QUADBLOCK).sum()),
+        "invalid_geometry": sorted(invalid_geometry),
+        "invalid_uvs": sorted(invalid_uvs),
+        "uvs_off_texel_grid": sorted(uvs_off_texel_grid),
+        "uvs_zero_area": sorted(uvs_zero_area),
+        "elapsed": time.time() - start_time,
+    }
+
+
+def run_worker(argv):
+    """Entry point inside Blender: ``blender -b file.blend --python batch_validate.py -- --worker --output out.json``."""
+    parser = argparse.ArgumentParser(prog="batch_validate.py --worker")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--check-uv-area", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = validate_open_file(args.check_uv_area)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(result, file)
+
+
+# -------------------------------
+# Launcher (spreads the files over a pool of Blender processes)
+# -------------------------------
+def validate_file(blender, blend_path, output, timeout, check_uv_area=False):
+    """Validates one .blend in a background Blender process and returns its result."""
+    command = [
+        blender, "--background", "--factory-startup", "--disable-autoexec",
+        blend_path,
+        "--python", os.path.abspath(__file__),
+        "--python-exit-code", "1",
+        "--", WORKER_FLAG, "--output", output,
+    ]
+    if check_uv_area:
+        command.append("--check-uv-area")
+    try:
+        process = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return {"file": blend_path, "error": str(e)}
+
+    if process.returncode != 0 or not os.path.exists(output):
+        return {"file": blend_path, "error": process.stderr.strip()[-2000:] or f"exit code {process.returncode}"}
+
+    with open(output, "r", encoding="utf-8") as file:
+        result = json.load(file)
+    result["file"] = blend_path
+    return result
+
+
+def merge_results(results):
+    """Combines the per-file results into one report with a summary."""
+    validated = [result for result in results if "error" not in result]
+    failed = [result for result in results if "error" in result]
+    summary = {
+        "files": len(results),
+        "failed": len(failed),
+        "files_with_invalid_data": sum(1 for r in validated if r["invalid_geometry"] or r["invalid_uvs"]),
+        "objects": sum(r["objects"] for r in validated),
+        "triblocks": sum(r["triblocks"] for r in validated),
+        "quadblocks": sum(r["quadblocks"] for r in validated),
+        "invalid_geometry": sum(len(r["invalid_geometry"]) for r in validated),
+        "invalid_uvs": sum(len(r["invalid_uvs"]) for r in validated),
+        "uvs_off_texel_grid": sum(len(r.get("uvs_off_texel_grid", ())) for r in validated),
+        "uvs_zero_area": sum(len(r.get("uvs_zero_area", ())) for r in validated),
+    }
+    return {"summary": summary, "files": validated, "failed": failed}
+
+
+def run_launcher(argv):
+    parser = argparse.ArgumentParser(description="Validate RaceTrackBuilder .blend files in background Blender processes.")
+    parser.add_argument("files", nargs="+", help=".blend files to validate")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--output", default="-", help="JSON report path ('-' for stdout)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Number of Blender processes")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per file")
+    parser.add_argument("--check-uv-area", action="store_true",
+                        help="Count faces with zero UV area as invalid UVs")
+    args = parser.parse_args(argv)
+
+    files = [os.path.abspath(path) for path in args.files]
+    with tempfile.TemporaryDirectory() as output_dir:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            outputs = [os.path.join(output_dir, f"{index}.json") for index in range(len(files))]
+            results = list(pool.map(
+                lambda path, output: validate_file(args.blender, path, output, args.timeout, args.check_uv_area),
+                files, outputs))
+
+    report = merge_results(results)
+    data = json.dumps(report, indent=4)
+    if args.output == "-":
+        print(data)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(data)
+
+    summary = report["summary"]
+    if summary["failed"]:
+        return 2
+    return 1 if summary["files_with_invalid_data"] else 0
+
+
+def main():
+    # Blender passes the script arguments after "--"
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    if WORKER_FLAG in argv:
+        argv.remove(WORKER_FLAG)
+        run_worker(argv)
+    else:
+        sys.exit(run_launcher(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Benchmark harness for the RaceTrackBuilder validation and snapping tools.
+
+Builds synthetic tracks made of separated quadblock/triblock objects (with a
+controllable fraction of broken blocks), registers the addon and times its
+operators. Results are written as JSON so runs can be compared.
+
+Run it with Blender's Python, in background mode:
+
+    blender --background --factory-startup --python benchmark.py -- \\
+        --blocks 1000 10000 50000 --invalid-fraction 0.05 --output bench.json
+
+Use ``--operators`` to time only some of them (see OPERATORS below).
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+import bpy
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+# Distance between neighbouring blocks of the synthetic track
+BLOCK_SPACING = 2.0
+# Number of objects used by the snap benchmark (its cost grows with the selection)
+SNAP_SELECTION = 64
+
+# Quadblock: 3x3 vertex grid with 4 quads
+QUAD_VERTS = [(x, y, 0.0) for y in range(3) for x in range(3)]
+QUAD_FACES = [(0, 1, 4, 3), (1, 2, 5, 4), (3, 4, 7, 6), (4, 5, 8, 7)]
+# Triblock: subdivided triangle (corners 0-2, midpoints 3-5)
+TRI_VERTS = [(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (1.0, 2.0, 0.0), (1.0, 0.0, 0.0), (1.5, 1.0, 0.0), (0.5, 1.0, 0.0)]
+TRI_FACES = [(0, 3, 5), (3, 1, 4), (5, 4, 2), (3, 4, 5)]
+
+
+def load_addon():
+    """Imports the addon package from this folder and registers it."""
+    spec = importlib.util.spec_from_file_location(
+        "racetrackbuilder", os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = addon
+    spec.loader.exec_module(addon)
+    addon.register()
+    return addon
+
+
+# -------------------------------
+# Synthetic track generation
+# -------------------------------
+def build_template(name, verts, faces, uv_offset=0.0, flip_face=False, merge_faces=False):
+    """Creates a block mesh used as template for the synthetic objects."""
+    faces = [list(face) for face in faces]
+    if flip_face:
+        faces[-1].reverse()
+    if merge_faces:
+        # Two quads merged into one hexagon: NGon plus wrong counts
+        faces = [faces[0][:2] + faces[1][1:3] + faces[0][2:]] + faces[2:]
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    mesh.vertices.foreach_set("select", [True] * len(mesh.vertices))
+
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    loop_verts = [0] * len(mesh.loops)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    uvs = []
+    for vertex_index in loop_verts:
+        x, y, _ = verts[vertex_index]
+        uvs.extend((x / 2 + uv_offset, y / 2))
+    uv_layer.data.foreach_set("uv", uvs)
+    return mesh
+
+
+def build_templates():
+    return {
+        "quadblock": build_template("bench_quadblock", QUAD_VERTS, QUAD_FACES),
+        "triblock": build_template("bench_triblock", TRI_VERTS, TRI_FACES),
+        "ngon": build_template("bench_ngon", QUAD_VERTS, QUAD_FACES, merge_faces=True),
+        "uv_out_of_range": build_template("bench_uv", QUAD_VERTS, QUAD_FACES, uv_offset=1.5),
+        "flipped": build_template("bench_flipped", QUAD_VERTS, QUAD_FACES, flip_face=True),
+    }
+
+
+def generate_track(block_count, invalid_fraction, triblock_fraction, jitter, seed):
+    """Replaces the scene content with a grid of ``block_count`` separated blocks."""
+    bpy.data.batch_remove(list(bpy.data.objects) + list(bpy.data.meshes))
+    rng = random.Random(seed)
+    templates = build_templates()
+    invalid_kinds = ("ngon", "uv_out_of_range", "flipped")
+
+    collection = bpy.context.scene.collection
+    columns = max(1, int(block_count ** 0.5))
+    for index in range(block_count):
+        roll = rng.random()
+        if roll < invalid_fraction:
+            kind = invalid_kinds[index % len(invalid_kinds)]
+        elif roll < invalid_fraction + triblock_fraction:
+            kind = "triblock"
+        else:
+            kind = "quadblock"
+
+        obj = bpy.data.objects.new(f"block_{index:06d}", templates[kind].copy())
+        obj.location = (
+            (index % columns) * BLOCK_SPACING + rng.uniform(-jitter, jitter),
+            (index // columns) * BLOCK_SPACING + rng.uniform(-jitter, jitter),
+            0.0,
+        )
+        collection.objects.link(obj)
+
+    for template in templates.values():
+        bpy.data.meshes.remove(template)
+    bpy.context.view_layer.update()
+
+
+# -------------------------------
+# Operators
+# -------------------------------
+def select_objects(objects):
+    for obj in bpy.context.view_layer.objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0] if objects else None
+
+
+def mesh_objects():
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+
+def run_find():
+    scene = bpy.context.scene
+    scene.find_option = 'TRIBLOCK'
+    bpy.ops.geometry.find_objects()
+    scene.find_option = 'QUADBLOCK'
+    bpy.ops.geometry.find_objects()
+
+
+def run_find_invalid():
+    bpy.ops.geometry.find_invalid()
+
+
+def run_find_duplicates():
+    bpy.ops.geometry.find_duplicates()
+
+
+def run_find_cracks():
+    bpy.ops.geometry.find_cracks()
+
+
+def run_attach_by_distance():
+    select_objects(mesh_objects())
+    bpy.ops.view3d.attach_by_distance_operator('EXEC_DEFAULT', distance_threshold=0.1)
+
+
+def run_snap_vertex_to_closest():
+    select_objects(mesh_objects()[:SNAP_SELECTION])
+    bpy.ops.view3d.snap_vertex_to_closest_operator()
+
+
+def run_clean_objects():
+    bpy.ops.object.clean_objects()
+
+
+def run_remove_invalid_data():
+    bpy.ops.geometry.remove_invalid_data()
+
+
+# Timed operators, in execution order (destructive ones last).
+# "find_invalid_cached" runs Find Invalid again to measure the validation cache.
+OPERATORS = {
+    "find": run_find,
+    "find_invalid": run_find_invalid,
+    "find_invalid_cached": run_find_invalid,
+    "find_duplicates": run_find_duplicates,
+    "find_cracks": run_find_cracks,
+    "attach_by_distance": run_attach_by_distance,
+    "snap_vertex_to_closest": run_snap_vertex_to_closest,
+    "clean_objects": run_clean_objects,
+    "remove_invalid_data": run_remove_invalid_data,
+}
+
+
+def time_operators(names):
+    timings = {}
+    for name in names:
+        start_time = time.perf_counter()
+        try:
+            OPERATORS[name]()
+        except RuntimeError as e:
+            timings[name] = None
+            print(f"{name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - start_time
+    return timings
+
+
+def summarize(runs, names):
+    """Median and minimum time per operator for every track size."""
+    summary = {}
+    for block_count in sorted({run["blocks"] for run in runs}):
+        per_size = {}
+        for name in names:
+            values = [run["timings"][name] for run in runs
+                      if run["blocks"] == block_count and run["timings"].get(name) is not None]
+            if values:
+                per_size[name] = {"median": statistics.median(values), "min": min(values)}
+        summary[str(block_count)] = per_size
+    return summary
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Benchmark RaceTrackBuilder operators.")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[1000, 10000, 50000], help="Track sizes to generate")
+    parser.add_argument("--invalid-fraction", type=float, default=0.05, help="Fraction of broken blocks")
+    parser.add_argument("--triblock-fraction", type=float, default=0.1, help="Fraction of triblocks")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Random offset applied to each block")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per track size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--operators", nargs="+", choices=list(OPERATORS), default=list(OPERATORS))
+    parser.add_argument("--output", default="bench_output.json", help="JSON results path")
+    args = parser.parse_args(argv)
+
+    load_addon()
+    names = [name for name in OPERATORS if name in args.operators]
+
+    runs = []
+    for block_count in args.blocks:
+        for repeat in range(args.repeat):
+            generate_track(block_count, args.invalid_fraction, args.triblock_fraction, args.jitter, args.seed + repeat)
+            timings = time_operators(names)
+            runs.append({"blocks": block_count, "repeat": repeat, "timings": timings})
+            print(f"{block_count} blocks, run {repeat + 1}/{args.repeat}: "
+                  + ", ".join(f"{name}={value:.3f}s" for name, value in timings.items() if value is not None))
+
+    results = {
+        "blender": bpy.app.version_string,
+        "settings": vars(args),
+        "runs": runs,
+        "summary": summarize(runs, names),
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=4)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
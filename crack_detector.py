@@ -0,0 +1,342 @@
+import bpy
+import gpu
+import time
+import numpy as np
+from gpu_extras.batch import batch_for_shader
+
+from .Find_invalid_data import grid_neighbour_pairs, is_mesh_edit_or_transform, mesh_fingerprint
+from .snap_vertex_to_closest import SNAP_EPSILON
+from .spatial_index import vertex_index
+from .track_budget import track_objects
+
+CRACK_COLOR = (1.0, 0.1, 0.1, 1.0)
+T_JUNCTION_COLOR = (1.0, 0.8, 0.0, 1.0)
+OVERLAY_POINT_SIZE = 8.0
+OVERLAY_LINE_WIDTH = 3.0
+# Delay before the overlay is recomputed after an edit (seconds)
+REFRESH_DELAY = 0.2
+
+# Boundary edges per mesh: mesh session_uid -> (fingerprint, (k, 2) vertex indices)
+boundary_cache = {}
+# Result of the last detection, drawn by the overlay
+crack_report = None
+# GPU batches built from crack_report on the next redraw
+overlay_batches = None
+draw_handle = None
+
+
+def boundary_edges(mesh):
+    """Edges used by a single face (the open border of a separated block), cached per mesh."""
+    fingerprint = mesh_fingerprint(mesh)
+    cached = boundary_cache.get(mesh.session_uid)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    loop_edges = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", loop_edges)
+    uses = np.bincount(loop_edges, minlength=len(mesh.edges))
+    result = edges.reshape(-1, 2)[uses == 1].astype(np.int64)
+    boundary_cache[mesh.session_uid] = (fingerprint, result)
+    return result
+
+
+def edge_segments(starts, ends, max_half_length):
+    """Splits edges into pieces no longer than ``2 * max_half_length``.
+
+    Returns the midpoint of every piece and the edge it belongs to, so a grid with
+    cells of ``max_half_length + tolerance`` finds every vertex near any edge.
+    """
+    lengths = np.linalg.norm(ends - starts, axis=1)
+    pieces = np.maximum(np.ceil(lengths / (2 * max_half_length)), 1).astype(np.int64)
+    edge = np.repeat(np.arange(len(starts)), pieces)
+    step = np.arange(len(edge)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    fraction = ((step + 0.5) / pieces[edge])[:, None]
+    return starts[edge] + (ends[edge] - starts[edge]) * fraction, edge
+
+
+def detect_cracks(objects, tolerance):
+    """Finds hairline cracks and T-junctions between the border edges of separate objects.
+
+    A crack is a pair of border vertices of different objects that are closer than
+    ``tolerance`` without being snapped. A T-junction is a border vertex that lies
+    within ``tolerance`` of the inside of a border edge of another object.
+    Returns world-space arrays for the overlay plus the names of the affected objects.
+    """
+    start_time = time.time()
+    local, counts, matrices, world = vertex_index.gather(objects)
+    offsets = np.cumsum(counts) - counts
+    edge_lists = [boundary_edges(obj.data) + offset for obj, offset in zip(objects, offsets.tolist())]
+    edges = np.concatenate(edge_lists) if edge_lists else np.empty((0, 2), dtype=np.int64)
+    owner = np.repeat(np.arange(len(objects)), counts)
+    border = np.unique(edges)
+
+    # Near-miss vertex pairs
+    first, second = grid_neighbour_pairs(world[border], tolerance)
+    a, b = border[first], border[second]
+    distance = np.linalg.norm(world[a] - world[b], axis=1)
+    gap = (owner[a] != owner[b]) & (distance > SNAP_EPSILON) & (distance <= tolerance)
+    crack_pairs = np.stack((a[gap], b[gap]), axis=1)
+
+    # Border vertices lying on a neighbour's border edge
+    junction_vertices = np.empty(0, dtype=np.int64)
+    junction_edges = np.empty(0, dtype=np.int64)
+    if len(edges):
+        starts, ends = world[edges[:, 0]], world[edges[:, 1]]
+        half_lengths = np.linalg.norm(ends - starts, axis=1) / 2
+        max_half_length = max(float(np.percentile(half_lengths, 90)), tolerance)
+        midpoints, segment_edge = edge_segments(starts, ends, max_half_length)
+
+        points = np.concatenate((world[border], midpoints))
+        first, second = grid_neighbour_pairs(points, max_half_length + tolerance)
+        # Pairs are ordered, so border vertices always come first
+        cross = (first < len(border)) & (second >= len(border))
+        vertex = border[first[cross]]
+        edge = segment_edge[second[cross] - len(border)]
+        keep = owner[vertex] != owner[edges[edge, 0]]
+        vertex, edge = vertex[keep], edge[keep]
+
+        direction = ends[edge] - starts[edge]
+        squared_length = np.maximum((direction ** 2).sum(axis=1), SNAP_EPSILON ** 2)
+        t = ((world[vertex] - starts[edge]) * direction).sum(axis=1) / squared_length
+        closest = starts[edge] + direction * t[:, None]
+        on_edge = (np.linalg.norm(world[vertex] - closest, axis=1) <= tolerance) & (t > 0) & (t < 1)
+        # Vertices matching an edge end are regular corners, not T-junctions
+        on_edge &= np.linalg.norm(world[vertex] - starts[edge], axis=1) > tolerance
+        on_edge &= np.linalg.norm(world[vertex] - ends[edge], axis=1) > tolerance
+        # A long edge split in pieces can report the same vertex twice
+        found = np.unique(np.stack((vertex[on_edge], edge[on_edge]), axis=1), axis=0)
+        junction_vertices, junction_edges = found[:, 0], found[:, 1]
+
+    affected = np.unique(np.concatenate((
+        owner[crack_pairs.ravel()], owner[junction_vertices], owner[edges[junction_edges, 0]])))
+    return {
+        "crack_lines": world[crack_pairs.ravel()],
+        "junction_points": world[junction_vertices],
+        "junction_lines": world[edges[junction_edges].ravel()],
+        "cracks": len(crack_pairs),
+        "t_junctions": len(junction_vertices),
+        "objects": [objects[index].name for index in affected.tolist()],
+        "elapsed": time.time() - start_time,
+    }
+
+
+def update_crack_report(scene):
+    global crack_report, overlay_batches
+    crack_report = detect_cracks(track_objects(scene), scene.crack_tolerance)
+    overlay_batches = None
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def draw_crack_overlay():
+    """Draws the cracks (red) and T-junctions (yellow) found by the last detection."""
+    global overlay_batches
+    if crack_report is None or not bpy.context.scene.crack_overlay:
+        return
+
+    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+    if overlay_batches is None:
+        layers = [
+            ('LINES', "crack_lines", CRACK_COLOR),
+            ('POINTS', "crack_lines", CRACK_COLOR),
+            ('LINES', "junction_lines", T_JUNCTION_COLOR),
+            ('POINTS', "junction_points", T_JUNCTION_COLOR),
+        ]
+        overlay_batches = [
+            (batch_for_shader(shader, primitive, {"pos": crack_report[key].astype(np.float32)}), color)
+            for primitive, key, color in layers if len(crack_report[key])
+        ]
+
+    gpu.state.depth_test_set('NONE')
+    gpu.state.blend_set('ALPHA')
+    gpu.state.point_size_set(OVERLAY_POINT_SIZE)
+    gpu.state.line_width_set(OVERLAY_LINE_WIDTH)
+    shader.bind()
+    for batch, color in overlay_batches:
+        shader.uniform_float("color", color)
+        batch.draw(shader)
+    gpu.state.line_width_set(1.0)
+    gpu.state.point_size_set(1.0)
+    gpu.state.blend_set('NONE')
+
+
+def refresh_crack_overlay():
+    """One-shot timer that re-runs the detection after blocks were edited or moved."""
+    scene = bpy.context.scene
+    if scene is not None and scene.crack_overlay:
+        update_crack_report(scene)
+    return None
+
+
+@bpy.app.handlers.persistent
+def crack_update_handler(scene, depsgraph):
+    """Schedules a new detection when geometry or transforms change (debounced).
+
+    Only the changed objects are re-read: their vertices through the shared vertex
+    index and their border edges through boundary_cache.
+    """
+    if not scene.crack_overlay:
+        return
+    if any(is_mesh_edit_or_transform(update) for update in depsgraph.updates):
+        if not bpy.app.timers.is_registered(refresh_crack_overlay):
+            bpy.app.timers.register(refresh_crack_overlay, first_interval=REFRESH_DELAY)
+
+
+@bpy.app.handlers.persistent
+def clear_crack_report(dummy):
+    """Starts over after loading a file; a saved live overlay is detected again."""
+    global crack_report, overlay_batches
+    boundary_cache.clear()
+    crack_report = None
+    overlay_batches = None
+    scene = bpy.context.scene
+    if scene is not None and scene.crack_overlay:
+        add_draw_handler()
+        if not bpy.app.timers.is_registered(refresh_crack_overlay):
+            bpy.app.timers.register(refresh_crack_overlay, first_interval=REFRESH_DELAY)
+
+
+def add_draw_handler():
+    global draw_handle
+    if draw_handle is None:
+        draw_handle = bpy.types.SpaceView3D.draw_handler_add(draw_crack_overlay, (), 'WINDOW', 'POST_VIEW')
+
+
+def remove_draw_handler():
+    global draw_handle
+    if draw_handle is not None:
+        bpy.types.SpaceView3D.draw_handler_remove(draw_handle, 'WINDOW')
+        draw_handle = None
+
+
+def update_overlay(self, context):
+    """Adds or removes the viewport draw handler when the overlay is toggled."""
+    if self.crack_overlay:
+        add_draw_handler()
+        update_crack_report(context.scene)
+    else:
+        remove_draw_handler()
+        for area in context.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+class OBJECT_OT_FindCracks(bpy.types.Operator):
+    """Find hairline cracks and T-junctions between neighbouring blocks"""
+    bl_idname = "geometry.find_cracks"
+    bl_label = "Find Cracks"
+
+    def execute(self, context):
+        update_crack_report(context.scene)
+        if crack_report["cracks"] or crack_report["t_junctions"]:
+            self.report({'WARNING'}, f"{crack_report['cracks']} cracks and {crack_report['t_junctions']} "
+                                     f"T-junctions in {len(crack_report['objects'])} objects.")
+        else:
+            self.report({'INFO'}, f"No cracks found ({crack_report['elapsed']:.3f} seconds).")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_SelectCracked(bpy.types.Operator):
+    """Select the objects involved in the cracks found by the last detection"""
+    bl_idname = "geometry.select_cracked"
+    bl_label = "Select Cracked Objects"
+
+    def execute(self, context):
+        if not crack_report or not crack_report["objects"]:
+            self.report({'INFO'}, "No cracked objects.")
+            return {'CANCELLED'}
+
+        bpy.ops.object.select_all(action='DESELECT')
+        selected = 0
+        for name in crack_report["objects"]:
+            obj = bpy.data.objects.get(name)
+            if obj and obj.visible_get():
+                obj.select_set(True)
+                selected += 1
+        self.report({'INFO'}, f"Selected {selected} cracked objects.")
+        return {'FINISHED'}
+
+
+class CrackDetectorPanel(bpy.types.Panel):
+    """Panel for the crack and T-junction detector"""
+    bl_label = "Cracks"
+    bl_idname = "PT_CRACK_DETECTOR"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Find Geometry"
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        col = layout.column()
+
+        col.prop(scene, "crack_tolerance", text="Tolerance")
+        col.prop(scene, "crack_overlay", text="Live Overlay")
+        col.operator("geometry.find_cracks", text="Find Cracks")
+
+        if crack_report is None:
+            return
+
+        box = layout.box()
+        row = box.row()
+        row.alert = crack_report["cracks"] > 0
+        row.label(text=f"Cracks: {crack_report['cracks']}")
+        row = box.row()
+        row.alert = crack_report["t_junctions"] > 0
+        row.label(text=f"T-junctions: {crack_report['t_junctions']}")
+        if crack_report["objects"]:
+            box.operator("geometry.select_cracked", text="Select Cracked Objects")
+
+
+classes = [
+    OBJECT_OT_FindCracks,
+    OBJECT_OT_SelectCracked,
+    CrackDetectorPanel,
+]
+
+
+def register():
+    bpy.types.Scene.crack_tolerance = bpy.props.FloatProperty(
+        name="Crack Tolerance",
+        description="Maximum gap between blocks reported as a crack or T-junction",
+        default=0.05,
+        min=0.0001
+    )
+    bpy.types.Scene.crack_overlay = bpy.props.BoolProperty(
+        name="Live Overlay",
+        description="Draw cracks and T-junctions in the viewport and refresh them after every edit",
+        default=False,
+        update=update_overlay
+    )
+
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    if crack_update_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(crack_update_handler)
+    if clear_crack_report not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_crack_report)
+
+
+def unregister():
+    if crack_update_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(crack_update_handler)
+    if clear_crack_report in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_crack_report)
+    if bpy.app.timers.is_registered(refresh_crack_overlay):
+        bpy.app.timers.unregister(refresh_crack_overlay)
+    remove_draw_handler()
+
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
+
+    del bpy.types.Scene.crack_tolerance
+    del bpy.types.Scene.crack_overlay
+
+
+if __name__ == "__main__":
+    register()
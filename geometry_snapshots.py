@@ -0,0 +1,81 @@
+import bpy
+import numpy as np
+
+
+class GeometrySnapshots:
+    """Original vertex positions of meshes, shared by the preview effects.
+
+    Each snapshot is one contiguous float32 (n, 3) array keyed by the mesh session_uid,
+    so it survives renames and is shared by every object using the mesh. A snapshot
+    whose vertex count no longer matches its mesh is stale: it is never restored and
+    stays until it is invalidated or captured again.
+    """
+
+    def __init__(self):
+        self.snapshots = {}
+
+    def __contains__(self, mesh):
+        return mesh.session_uid in self.snapshots
+
+    def capture(self, mesh, refresh=False):
+        """Stores the current positions of ``mesh`` (unless already stored) and returns them."""
+        snapshot = self.snapshots.get(mesh.session_uid)
+        if snapshot is None or refresh:
+            coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", coords)
+            snapshot = coords.reshape(-1, 3)
+            self.snapshots[mesh.session_uid] = snapshot
+        return snapshot
+
+    def get(self, mesh):
+        """The snapshot of ``mesh``, or None if there is none or it is stale."""
+        snapshot = self.snapshots.get(mesh.session_uid)
+        if snapshot is None or len(snapshot) != len(mesh.vertices):
+            return None
+        return snapshot
+
+    def matches(self, mesh):
+        """O(1) topology check: False if the snapshot exists but the vertex count changed."""
+        snapshot = self.snapshots.get(mesh.session_uid)
+        return snapshot is None or len(snapshot) == len(mesh.vertices)
+
+    def restore(self, mesh):
+        """Writes the snapshot back to the mesh. Returns False if it is missing or stale."""
+        snapshot = self.get(mesh)
+        if snapshot is None:
+            return False
+        mesh.vertices.foreach_set("co", snapshot.ravel())
+        mesh.update()
+        return True
+
+    def invalidate(self, mesh=None):
+        """Forgets the snapshot of ``mesh`` (all snapshots if None)."""
+        if mesh is None:
+            self.snapshots.clear()
+        else:
+            self.snapshots.pop(mesh.session_uid, None)
+
+    @property
+    def nbytes(self):
+        return sum(snapshot.nbytes for snapshot in self.snapshots.values())
+
+
+# Store shared by every preview effect
+snapshots = GeometrySnapshots()
+
+
+@bpy.app.handlers.persistent
+def clear_snapshots(dummy):
+    """session_uid values are only valid for the open file."""
+    snapshots.invalidate()
+
+
+def register():
+    if clear_snapshots not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_snapshots)
+
+
+def unregister():
+    if clear_snapshots in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_snapshots)
+    snapshots.invalidate()
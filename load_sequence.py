@@ -1,117 +1,457 @@
 import bpy
 import bmesh
 import json
-
-# Global variable to store UV data loaded from JSON
-loaded_uvs_data = {}
+import os
+import tempfile
+import time
+from collections import OrderedDict
+import numpy as np
+
+from .uv_sequence_format import ENCODING_FLOAT32, EXTENSION as SEQUENCE_EXTENSION, UVSequenceFile, convert_json
+
+# Registry of the objects animated by the loaded JSON, keyed by object session_uid:
+# {"object": Object, "frames": [float32 array (loops * 2) or None] or StreamedFrames,
+#  "textures": [path or None],
+#  "last_frame": frame index applied by the previous call or None}
+animated_objects = {}
+
+# Texture path -> Image datablock (None if it could not be loaded), filled at load time
+texture_images = {}
+# Material session_uid -> name of its first Image Texture node (None if it has none).
+# Names, not nodes: a node deleted by the artist must never be dereferenced.
+material_image_nodes = {}
+
+# Memory-mapped binary file the compiled frames point into (None for JSON animations)
+sequence_file = None
+# Binary file converted from a JSON for streaming, deleted when the animation is released
+temporary_sequence_path = None
+
+# Frames decoded ahead of the current one by the streaming mode
+READ_AHEAD = 8
+# Seconds the read-ahead timer may spend per call
+READ_AHEAD_BUDGET = 0.004
+
+class FrameCache:
+    """Bounded LRU of decoded frames, keyed by (object session_uid, frame index)."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.nbytes = 0
+
+    def __contains__(self, key):
+        return key in self.frames
+
+    def get(self, key):
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.frames.move_to_end(key)
+        return frame
+
+    def put(self, key, frame):
+        if key in self.frames:
+            self.nbytes -= self.frames.pop(key).nbytes
+        self.frames[key] = frame
+        self.nbytes += frame.nbytes
+        # Evict the least recently used frames, always keeping the newest one
+        while self.nbytes > self.max_bytes and len(self.frames) > 1:
+            self.nbytes -= self.frames.popitem(last=False)[1].nbytes
+
+    def clear(self):
+        self.frames.clear()
+        self.nbytes = 0
+
+# Decoded frames of every streamed animation
+frame_cache = FrameCache()
+# Object session_uid -> (StreamedFrames, last played index) waiting for read-ahead
+read_ahead_requests = OrderedDict()
+
+class StreamedFrames:
+    """Frames of one object decoded on demand through frame_cache; used like a list."""
+
+    def __init__(self, key, count, decode):
+        self.key = key
+        self.count = count
+        self.decode = decode
+
+    def __len__(self):
+        return self.count
+
+    def fetch(self, index):
+        frame = frame_cache.get((self.key, index))
+        if frame is None:
+            frame = self.decode(index)
+            if frame is not None:
+                frame_cache.put((self.key, index), frame)
+        return frame
+
+    def __getitem__(self, index):
+        frame = self.fetch(index)
+        request_read_ahead(self, index)
+        return frame
+
+def request_read_ahead(frames, index):
+    """Asks the read-ahead timer to decode the frames following ``index``."""
+    read_ahead_requests[frames.key] = (frames, index)
+    if not bpy.app.timers.is_registered(read_ahead_frames):
+        bpy.app.timers.register(read_ahead_frames, first_interval=0.0)
+
+def read_ahead_frames():
+    """Timer: decodes the next READ_AHEAD frames of the played animations within a time budget."""
+    deadline = time.perf_counter() + READ_AHEAD_BUDGET
+    while read_ahead_requests:
+        key, (frames, index) = next(iter(read_ahead_requests.items()))
+        for offset in range(1, min(READ_AHEAD, len(frames) - 1) + 1):
+            next_index = (index + offset) % len(frames)
+            if (key, next_index) not in frame_cache:
+                frames.fetch(next_index)
+                if time.perf_counter() > deadline:
+                    return 0.001  # Continue on the next call
+        del read_ahead_requests[key]
+    return None
+
+def preload_textures(texture_paths):
+    """Loads (or finds already loaded) every texture used by the animations, once."""
+    for texture_path in texture_paths:
+        if texture_path in texture_images:
+            continue
+        try:
+            texture_images[texture_path] = bpy.data.images.load(texture_path, check_existing=True)
+        except RuntimeError:
+            print(f"Could not load texture: {texture_path}")
+            texture_images[texture_path] = None
+
+def material_image_node(material):
+    """The Image Texture node whose image is swapped, resolved once per material.
+
+    The cached node is looked up by name; if it was deleted or replaced the
+    material is resolved again.
+    """
+    if not material.use_nodes:
+        return None
+    nodes = material.node_tree.nodes
+    key = material.session_uid
+    if key in material_image_nodes:
+        name = material_image_nodes[key]
+        node = nodes.get(name) if name is not None else None
+        if name is None or (node is not None and node.type == 'TEX_IMAGE'):
+            return node
+    node = next((node for node in nodes if node.type == 'TEX_IMAGE'), None)
+    material_image_nodes[key] = node.name if node is not None else None
+    return node
 
 def update_texture(obj, texture_path):
-    """Changes the object's texture if the JSON contains a new one."""
-    if not texture_path or texture_path == "No Texture":
+    """Changes the object's texture if the JSON contains a new one.
+
+    Images and nodes come from the caches filled at load time; nothing is loaded
+    here and the node is only written when the image actually changes.
+    """
+    img = texture_images.get(texture_path)
+    material = obj.active_material
+    if img is None or material is None:
         return  # Do not change the texture if there is no valid one
 
-    # Ensure standardized path format
-    texture_path = texture_path.replace("\\", "/")
-
-    if obj.active_material and obj.active_material.use_nodes:
-        for node in obj.active_material.node_tree.nodes:
-            if node.type == 'TEX_IMAGE':
-                img = bpy.data.images.get(texture_path)
-                if not img:
-                    try:
-                        img = bpy.data.images.load(texture_path)
-                    except:
-                        print(f"Could not load texture: {texture_path}")
-                        return
-                
-                node.image = img  # Assign the new texture
-                print(f"Texture changed for {obj.name} to: {texture_path}")
-                break
-
-def update_uv_animation(scene):
-    """Updates UVs and texture according to the current frame for all objects in the scene."""
-    global loaded_uvs_data
-
-    for obj in bpy.data.objects:
-        if obj.type != 'MESH' or obj.name not in loaded_uvs_data:
-            continue  # Skip non-mesh objects or objects not in JSON
-
-        uvs_list = loaded_uvs_data[obj.name]  # Animation data for this object
-        if "frames" not in uvs_list or not uvs_list["frames"]:
-            continue  # Skip if no frames exist for this object
-
-        frames = uvs_list["frames"]
-        frame_index = str(scene.frame_current % len(frames))  # Get current frame index
-
-        if frame_index not in frames:
+    node = material_image_node(material)
+    if node is not None and node.image != img:
+        node.image = img  # Assign the new texture
+
+def loop_indices(loop_starts, loop_totals):
+    """Indices of all the loops of the given faces, in order."""
+    offsets = np.repeat(loop_starts - (np.cumsum(loop_totals) - loop_totals), loop_totals)
+    return np.arange(int(loop_totals.sum())) + offsets
+
+def mesh_uv_layout(me):
+    """(loop_totals, loop_starts, current UVs as float32) of a mesh, or None without an active UV map."""
+    uv_layer = me.uv_layers.active
+    if uv_layer is None:
+        return None
+
+    loop_totals = np.empty(len(me.polygons), dtype=np.int64)
+    loop_starts = np.empty(len(me.polygons), dtype=np.int64)
+    me.polygons.foreach_get("loop_total", loop_totals)
+    me.polygons.foreach_get("loop_start", loop_starts)
+    base = np.empty(len(me.loops) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", base)
+    return loop_totals, loop_starts, base
+
+def compile_frames(obj, obj_data):
+    """Compiles the JSON frames of an object into flat float32 UV arrays in loop order.
+
+    Faces whose number of loops does not match the mesh keep the UVs the mesh has
+    now. Frames whose face count does not match the mesh are left as None.
+    Returns None if the object has no active UV map.
+    """
+    layout = mesh_uv_layout(obj.data)
+    if layout is None:
+        return None
+    loop_totals, loop_starts, base = layout
+
+    frames_data = obj_data.get("frames") or {}
+    frames = []
+    textures = []
+    for index in range(len(frames_data)):
+        frame_data = frames_data.get(str(index))
+        texture = frame_data.get("Texture") if frame_data else None
+        textures.append(texture.replace("\\", "/") if texture and texture != "No Texture" else None)
+
+        face_uvs = frame_data.get("UVs", []) if frame_data else []
+        if len(face_uvs) != len(loop_totals):
+            if frame_data:
+                print(f"Warning: The number of faces in frame {index} does not match the mesh for {obj.name}.")
+            frames.append(None)
             continue
 
-        frame_data = frames[frame_index]
-
-        me = obj.data
-        bm = bmesh.from_edit_mesh(me) if obj.mode == 'EDIT' else bmesh.new()
-        if obj.mode != 'EDIT':
-            bm.from_mesh(me)
-
+        sizes = np.fromiter((len(uvs) for uvs in face_uvs), dtype=np.int64, count=len(face_uvs))
+        match = sizes == loop_totals
+        if not match.all():
+            print(f"Warning: Different number of loops in {int((~match).sum())} faces of {obj.name}, frame {index}")
+        flat = np.array([uv for uvs, ok in zip(face_uvs, match.tolist()) if ok for uv in uvs], dtype=np.float32)
+        uvs = base.reshape(-1, 2).copy()
+        uvs[loop_indices(loop_starts[match], loop_totals[match])] = flat.reshape(-1, 2)
+        frames.append(uvs.ravel())
+
+    return {"frames": frames, "textures": textures}
+
+def sequence_decoder(obj, sequence):
+    """Function decoding a frame stored in a binary file into the mesh loop order.
+
+    Returns (decode, zero_copy), zero_copy being True when the frames are the
+    memory-mapped arrays themselves, or None if the object has no active UV map or
+    its face count does not match the stored one.
+    """
+    layout = mesh_uv_layout(obj.data)
+    if layout is None:
+        return None
+    loop_totals, loop_starts, base = layout
+
+    if len(sequence.loop_totals) != len(loop_totals):
+        print(f"Warning: The number of faces in the sequence does not match the mesh for {obj.name}.")
+        return None
+
+    stored_totals = sequence.loop_totals.astype(np.int64)
+    match = stored_totals == loop_totals
+    if match.all() and np.array_equal(loop_starts, np.cumsum(loop_totals) - loop_totals):
+        return sequence.frame, sequence.encoding == ENCODING_FLOAT32
+
+    if not match.all():
+        print(f"Warning: Different number of loops in {int((~match).sum())} faces of {obj.name}")
+    target = loop_indices(loop_starts[match], loop_totals[match])
+    source = loop_indices((np.cumsum(stored_totals) - stored_totals)[match], stored_totals[match])
+
+    def decode(index):
+        stored = sequence.frame(index)
+        if stored is None:
+            return None
+        uvs = base.reshape(-1, 2).copy()
+        uvs[target] = stored.reshape(-1, 2)[source]
+        return uvs.ravel()
+
+    return decode, False
+
+def compile_sequence(obj, sequence, streaming=False):
+    """Compiles the frames of an object stored in a binary file (see uv_sequence_format).
+
+    When the stored faces match the mesh loop for loop the frames of float32 files
+    are the memory-mapped arrays themselves: the OS pages them in on demand. Other
+    frames are rebuilt on top of the current UVs like compile_frames does, all at
+    once or, when ``streaming``, on demand through frame_cache.
+    Returns None without an active UV map or with another face count.
+    """
+    decoder = sequence_decoder(obj, sequence)
+    if decoder is None:
+        return None
+    decode, zero_copy = decoder
+
+    textures = list(sequence.textures)
+    if streaming and not zero_copy:
+        frames = StreamedFrames(obj.session_uid, sequence.frame_count, decode)
+    else:
+        frames = [decode(index) for index in range(sequence.frame_count)]
+    return {"frames": frames, "textures": textures}
+
+def remove_temporary_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        print(f"Could not remove temporary file: {path}")
+
+def close_sequence_file():
+    """Releases the binary file and the streamed frames of the previous animation, if any."""
+    global sequence_file, temporary_sequence_path
+    frame_cache.clear()
+    read_ahead_requests.clear()
+    if sequence_file is not None:
+        sequence_file.close()
+        sequence_file = None
+    if temporary_sequence_path is not None:
+        remove_temporary_file(temporary_sequence_path)
+        temporary_sequence_path = None
+
+def apply_uv_frame(obj, uvs):
+    """Writes one compiled frame to the object's active UV map."""
+    me = obj.data
+    if len(uvs) != len(me.loops) * 2:
+        return False  # The topology changed since the animation was loaded
+
+    if obj.mode == 'EDIT':
+        # Edit mode keeps its own copy of the mesh: write through bmesh
+        bm = bmesh.from_edit_mesh(me)
         uv_layer = bm.loops.layers.uv.active
         if uv_layer is None:
-            continue
-
-        frame_uvs = frame_data["UVs"]
+            return False
+        uv_pairs = uvs.reshape(-1, 2).tolist()
+        loops = [loop for face in bm.faces for loop in face.loops]
+        if len(loops) != len(uv_pairs):
+            return False
+        for loop, uv in zip(loops, uv_pairs):
+            loop[uv_layer].uv = uv
+        bmesh.update_edit_mesh(me, loop_triangles=True)
+        return True
+
+    uv_layer = me.uv_layers.active
+    if uv_layer is None:
+        return False
+    uv_layer.data.foreach_set("uv", uvs)
+    me.update()
+    return True
+
+def resolve_animated_objects():
+    """Refreshes the object references of the registry (they go stale after undo)."""
+    objects = {obj.session_uid: obj for obj in bpy.data.objects if obj.session_uid in animated_objects}
+    for key in list(animated_objects):
+        if key in objects:
+            animated_objects[key]["object"] = objects[key]
+        else:
+            del animated_objects[key]  # The object was deleted
 
-        # Ensure the face count matches
-        if len(frame_uvs) != len(bm.faces):
-            print(f"Warning: The number of faces in the JSON does not match the mesh for {obj.name}.")
+def update_uv_animation(scene):
+    """Updates UVs and texture according to the current frame for the animated objects only."""
+    try:
+        entries = [(entry, entry["object"].name) for entry in animated_objects.values()]
+    except ReferenceError:
+        resolve_animated_objects()
+        entries = [(entry, entry["object"].name) for entry in animated_objects.values()]
+
+    for animation, obj_name in entries:
+        frames = animation["frames"]
+        frame_index = scene.frame_current % len(frames)  # Get current frame index
+        if frame_index == animation["last_frame"]:
+            continue  # Same frame as the previous call: nothing to do
+        animation["last_frame"] = frame_index
+
+        obj = animation["object"]
+        uvs = frames[frame_index]
+        if uvs is None or not apply_uv_frame(obj, uvs):
             continue
 
-        for face, uv_data in zip(bm.faces, frame_uvs):
-            if len(face.loops) != len(uv_data):
-                print(f"Warning: Different number of loops in face {face.index} of {obj.name}")
-                continue  # Skip this face if the structure does not match
-
-            for loop, uv in zip(face.loops, uv_data):
-                loop[uv_layer].uv = (uv[0], uv[1])
-
-        if obj.mode != 'EDIT':
-            bm.to_mesh(me)
-            bm.free()
-        else:
-            bmesh.update_edit_mesh(me, loop_triangles=True)
-
         # Change texture if necessary
-        if "Texture" in frame_data:
-            update_texture(obj, frame_data["Texture"])
+        if animation["textures"][frame_index]:
+            update_texture(obj, animation["textures"][frame_index])
+
+@bpy.app.handlers.persistent
+def reset_uv_animation_state(dummy):
+    """After undo the mesh UVs may differ from the last applied frame: apply it again."""
+    resolve_animated_objects()
+    for animation in animated_objects.values():
+        animation["last_frame"] = None
+    # Datablock references do not survive undo either
+    material_image_nodes.clear()
+    paths = list(texture_images)
+    texture_images.clear()
+    preload_textures(paths)
+
+@bpy.app.handlers.persistent
+def clear_uv_animations(dummy):
+    """The registry belongs to the file it was loaded in."""
+    animated_objects.clear()
+    texture_images.clear()
+    material_image_nodes.clear()
+    close_sequence_file()
 
 class UV_OT_LoadUVsFromJSON(bpy.types.Operator):
-    """Loads a JSON file with UVs for multiple objects"""
+    """Loads a JSON (or binary .rtuv) file with UVs for multiple objects"""
     bl_idname = "uv.load_uvs_json"
     bl_label = "Load UVs from JSON"
     bl_options = {'REGISTER', 'UNDO'}
 
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.json;*" + SEQUENCE_EXTENSION, options={'HIDDEN'})
+    streaming: bpy.props.BoolProperty(
+        name="Stream Frames",
+        description="Decode frames on demand into a bounded cache instead of loading them all "
+                    "(JSON files are converted to a temporary binary file first)",
+        default=False,
+    )
+    cache_size: bpy.props.IntProperty(
+        name="Frame Cache (MB)",
+        description="Memory kept for decoded frames in streaming mode",
+        default=64,
+        min=1,
+    )
 
     def execute(self, context):
-        global loaded_uvs_data
-
+        global sequence_file, temporary_sequence_path
+        sequence = None
+        temporary_path = None
         try:
-            with open(self.filepath, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            if self.filepath.lower().endswith(SEQUENCE_EXTENSION) or self.streaming:
+                if not self.filepath.lower().endswith(SEQUENCE_EXTENSION):
+                    # Streaming a JSON: index its frames in a temporary binary file
+                    handle, temporary_path = tempfile.mkstemp(suffix=SEQUENCE_EXTENSION)
+                    os.close(handle)
+                    convert_json(self.filepath, temporary_path)
+                # Binary file: frames are read straight from the memory map
+                sequence = UVSequenceFile(temporary_path or self.filepath)
+                data = sequence.objects
+                def compile_animation(obj, obj_data):
+                    return compile_sequence(obj, obj_data, self.streaming)
+            else:
+                with open(self.filepath, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                compile_animation = compile_frames
 
             if not isinstance(data, dict) or not data:
                 self.report({'ERROR'}, "The JSON does not have the correct format.")
+                if sequence is not None:
+                    sequence.close()
+                if temporary_path is not None:
+                    remove_temporary_file(temporary_path)
                 return {'CANCELLED'}
 
-            # Convert all texture paths to use `/` for consistency
-            for obj_data in data.values():
-                for frame_data in obj_data["frames"].values():
-                    if "Texture" in frame_data and frame_data["Texture"] != "No Texture":
-                        frame_data["Texture"] = frame_data["Texture"].replace("\\", "/")
-
-            loaded_uvs_data = data  # Store all animation data from JSON
-
-            self.report({'INFO'}, f"JSON file loaded with {len(loaded_uvs_data)} objects.")
+            # Compile every animation once: playback only copies arrays
+            compiled = {}
+            missing = []
+            for obj_name, obj_data in data.items():
+                obj = bpy.data.objects.get(obj_name)
+                animation = compile_animation(obj, obj_data) if obj and obj.type == 'MESH' else None
+                if animation is None or not animation["frames"]:
+                    missing.append(obj_name)
+                else:
+                    animation["object"] = obj
+                    animation["last_frame"] = None
+                    compiled[obj.session_uid] = animation
+
+            # Only the registered objects are visited by the frame handler
+            animated_objects.clear()
+            animated_objects.update(compiled)
+            close_sequence_file()
+            sequence_file = sequence
+            temporary_sequence_path = temporary_path
+            frame_cache.max_bytes = self.cache_size * 1024 * 1024
+            material_image_nodes.clear()
+            preload_textures({path for animation in compiled.values() for path in animation["textures"] if path})
+
+            if missing:
+                self.report({'WARNING'}, f"UV file loaded with {len(compiled)} objects. "
+                                         f"Skipped (missing, not a mesh, without UVs or with other faces): {', '.join(missing)}")
+            else:
+                self.report({'INFO'}, f"UV file loaded with {len(animated_objects)} objects.")
 
         except Exception as e:
+            if sequence is not None and sequence is not sequence_file:
+                sequence.close()
+            if temporary_path is not None and temporary_path != temporary_sequence_path:
+                remove_temporary_file(temporary_path)
             self.report({'ERROR'}, f"Error loading JSON: {str(e)}")
             return {'CANCELLED'}
 
@@ -132,23 +472,41 @@ class UV_PT_UVToolsPanel(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
         layout.operator("uv.load_uvs_json", text="Load UVs from JSON", icon="FILE_FOLDER")
-        layout.label(text="UV Animation is Active for Multiple Objects!")
+        if animated_objects:
+            layout.label(text=f"UV Animation is Active for {len(animated_objects)} Objects!")
+        if frame_cache.frames:
+            layout.label(text=f"Frame cache: {frame_cache.nbytes / 1048576:.1f} / "
+                              f"{frame_cache.max_bytes / 1048576:.0f} MB")
 
 def register():
     bpy.utils.register_class(UV_OT_LoadUVsFromJSON)
     bpy.utils.register_class(UV_PT_UVToolsPanel)
 
-    # Avoid adding the handler multiple times
+    # Avoid adding the handlers multiple times
     if update_uv_animation not in bpy.app.handlers.frame_change_post:
         bpy.app.handlers.frame_change_post.append(update_uv_animation)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if reset_uv_animation_state not in handlers:
+            handlers.append(reset_uv_animation_state)
+    if clear_uv_animations not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_uv_animations)
 
 def unregister():
     bpy.utils.unregister_class(UV_OT_LoadUVsFromJSON)
     bpy.utils.unregister_class(UV_PT_UVToolsPanel)
 
-    # Remove the handler if present
+    # Remove the handlers if present
     if update_uv_animation in bpy.app.handlers.frame_change_post:
         bpy.app.handlers.frame_change_post.remove(update_uv_animation)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if reset_uv_animation_state in handlers:
+            handlers.remove(reset_uv_animation_state)
+    if clear_uv_animations in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_uv_animations)
+    if bpy.app.timers.is_registered(read_ahead_frames):
+        bpy.app.timers.unregister(read_ahead_frames)
+    animated_objects.clear()
+    close_sequence_file()
 
 if __name__ == "__main__":
     register()
@@ -1,71 +1,347 @@
 import bpy
-import bmesh
-import random
+import time
+import zlib
+import numpy as np
+
+from .geometry_snapshots import snapshots
 
 # Variable global para controlar el temporizador
 wiggle_timer = None
 # Variable global para recordar el estado previo del wiggle
 previous_wiggle_state = False
 
-# Diccionario para guardar las posiciones originales de los vértices
-original_vertices = {}
+# Tablas de jitter precalculadas: mesh session_uid -> (semilla, nº de vértices, int8 (JITTER_FRAMES, n, 3))
+JITTER_FRAMES = 16
+jitter_tables = {}
+# Índice de frame del wiggle en vivo (fuera de la reproducción se avanza en cada tick)
+jitter_frame = 0
+
+# Modo de vista previa: modificador de geometry nodes gestionado por el addon
+WIGGLE_MODIFIER = "PS1 Wiggle"
+WIGGLE_NODE_GROUP = "PS1 Wiggle"
+WIGGLE_STEP = 1/16
+
+# Planificador: objetos dentro de la vista, refrescados cada VISIBILITY_INTERVAL segundos
+VISIBILITY_INTERVAL = 0.25
+scheduled_objects = []
+visibility_time = 0.0
+# Posición de la ronda: los objetos que no caben en el presupuesto siguen en el próximo tick
+wiggle_cursor = 0
+# Mallas de la escena para el recorte y su posición en scene.objects; solo se
+# recorren de nuevo cuando cambia el conjunto de objetos
+culling_objects = []
+culling_indices = np.empty(0, dtype=np.int64)
+culling_key = None
+culling_rebuild = True
+# Visibilidad ya aplicada a los modificadores de vista previa (None: aplicar a todos)
+preview_visible = None
 
-def quantize(value, step=1/16):
-    """Cuantiza un valor a un paso fijo, simulando precisión de PS1."""
-    return round(value / step) * step
+# True mientras se renderiza: solo entonces el wiggle en modo Mesh cubre todos los objetos
+rendering = False
+
+# Mallas escritas por el propio wiggle desde el último handler: sus updates se ignoran
+wiggle_written = set()
+# Objetos cuya geometría ya no coincide con la guardada: session_uid -> nombre
+modified_objects = {}
+
+def quantize(values, step=1/16):
+    """Cuantiza valores (escalares o arrays) a un paso fijo, simulando precisión de PS1."""
+    return np.round(np.asarray(values) / step) * step
 
 def save_original_positions(obj):
-    """Guarda la posición original de los vértices de un objeto."""
+    """Guarda la posición original de los vértices de un objeto en el almacén compartido."""
     if obj.type != 'MESH':
         return
-    mesh = obj.data
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    original_vertices[obj.name] = [(vert.co.x, vert.co.y, vert.co.z) for vert in bm.verts]
-    bm.free()
-
-def restore_original_positions(obj):
-    """Restaura la posición original de los vértices de un objeto."""
-    if obj.type != 'MESH' or obj.name not in original_vertices:
+    snapshots.capture(obj.data)
+
+def restore_original_positions(obj, forget=False):
+    """Restaura la posición original de los vértices de un objeto.
+
+    Con ``forget`` la copia se descarta después, para que una edición posterior no
+    se deshaga al volver a activar el wiggle.
+    """
+    if obj.type != 'MESH':
         return
-    mesh = obj.data
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    for vert, original_pos in zip(bm.verts, original_vertices[obj.name]):
-        vert.co.x, vert.co.y, vert.co.z = original_pos
-    bm.to_mesh(mesh)
-    bm.free()
-
-def ps1_wiggle(obj, step=1/16, intensity=0.002):
-    """Aplica el efecto de 'wiggle' dinámico a los vértices."""
+    snapshots.restore(obj.data)
+    if forget:
+        snapshots.invalidate(obj.data)
+
+def jitter_table(mesh, seed):
+    """Tabla de ruido determinista de la malla: JITTER_FRAMES juegos de desplazamientos.
+
+    La semilla combina la de la escena con el nombre de la malla, así que el resultado
+    se repite entre sesiones (capturas, renders de secuencias). Se guarda en int8 para
+    ocupar 3 bytes por vértice y frame.
+    """
+    seed = (seed + zlib.crc32(mesh.name.encode())) & 0xFFFFFFFF
+    cached = jitter_tables.get(mesh.session_uid)
+    if cached is not None and cached[0] == seed and cached[1] == len(mesh.vertices):
+        return cached[2]
+    rng = np.random.default_rng(seed)
+    table = rng.integers(-127, 128, size=(JITTER_FRAMES, len(mesh.vertices), 3), dtype=np.int8)
+    jitter_tables[mesh.session_uid] = (seed, len(mesh.vertices), table)
+    return table
+
+def ps1_wiggle(obj, step=1/16, intensity=0.002, frame=0, seed=0):
+    """Aplica el efecto de 'wiggle' dinámico a los vértices.
+
+    Parte siempre de las posiciones originales guardadas (no de las ya movidas), las
+    cuantiza y les suma el juego de la tabla de jitter que toca en ``frame``, y escribe
+    con foreach_set.
+    """
     if obj.type != 'MESH':
         return
     mesh = obj.data
-    bm = bmesh.new()
-    bm.from_mesh(mesh)
-    for vert in bm.verts:
-        vert.co.x = quantize(vert.co.x, step) + random.uniform(-intensity, intensity)
-        vert.co.y = quantize(vert.co.y, step) + random.uniform(-intensity, intensity)
-        vert.co.z = quantize(vert.co.z, step) + random.uniform(-intensity, intensity)
-    bm.to_mesh(mesh)
-    bm.free()
+    if mesh not in snapshots:
+        snapshots.capture(mesh)
+    original = snapshots.get(mesh)
+    if original is None:
+        return
+    offsets = jitter_table(mesh, seed)[frame % JITTER_FRAMES]
+    wiggled = quantize(original, step) + offsets * (intensity / 127)
+    mesh.vertices.foreach_set("co", wiggled.astype(np.float32).ravel())
+    mesh.update()
+    wiggle_written.add(mesh.session_uid)
+
+def wiggle_node_group(create=True):
+    """Grupo de nodos que cuantiza la posición y le suma ruido sin tocar la malla.
+
+    Paso, intensidad y semilla son nodos internos del grupo, así que cada tick solo
+    cambia un valor compartido por todos los objetos.
+    """
+    group = bpy.data.node_groups.get(WIGGLE_NODE_GROUP)
+    if group is not None or not create:
+        return group
+
+    group = bpy.data.node_groups.new(WIGGLE_NODE_GROUP, 'GeometryNodeTree')
+    group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes, links = group.nodes, group.links
+
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+    position = nodes.new('GeometryNodeInputPosition')
+    step = nodes.new('ShaderNodeValue')
+    step.name = "Wiggle Step"
+    step.outputs[0].default_value = WIGGLE_STEP
+    snap = nodes.new('ShaderNodeVectorMath')
+    snap.operation = 'SNAP'
+
+    seed = nodes.new('FunctionNodeInputInt')
+    seed.name = "Wiggle Seed"
+    noise = nodes.new('FunctionNodeRandomValue')
+    noise.data_type = 'FLOAT_VECTOR'
+    noise.inputs[0].default_value = (-1.0, -1.0, -1.0)
+    noise.inputs[1].default_value = (1.0, 1.0, 1.0)
+    intensity = nodes.new('ShaderNodeValue')
+    intensity.name = "Wiggle Intensity"
+    scale = nodes.new('ShaderNodeVectorMath')
+    scale.operation = 'SCALE'
+    add = nodes.new('ShaderNodeVectorMath')
+    add.operation = 'ADD'
+    set_position = nodes.new('GeometryNodeSetPosition')
+
+    links.new(position.outputs[0], snap.inputs[0])
+    links.new(step.outputs[0], snap.inputs[1])
+    links.new(seed.outputs[0], noise.inputs["Seed"])
+    links.new(noise.outputs[0], scale.inputs[0])
+    links.new(intensity.outputs[0], scale.inputs["Scale"])
+    links.new(snap.outputs[0], add.inputs[0])
+    links.new(scale.outputs[0], add.inputs[1])
+    links.new(group_input.outputs[0], set_position.inputs["Geometry"])
+    links.new(add.outputs[0], set_position.inputs["Position"])
+    links.new(set_position.outputs[0], group_output.inputs[0])
+    return group
+
+def attach_wiggle_modifiers(objects, group):
+    """Añade el modificador del wiggle a los objetos mesh de ``objects`` que no lo tienen."""
+    for obj in objects:
+        if obj.type == 'MESH' and WIGGLE_MODIFIER not in obj.modifiers:
+            modifier = obj.modifiers.new(WIGGLE_MODIFIER, 'NODES')
+            modifier.node_group = group
+            modifier.show_in_editmode = False
+
+def add_wiggle_modifiers(scene):
+    """Añade el modificador del wiggle a los objetos mesh de la escena que no lo tienen."""
+    global preview_visible
+    preview_visible = None
+    group = wiggle_node_group()
+    group.nodes["Wiggle Intensity"].outputs[0].default_value = scene.wiggle_intensity
+    attach_wiggle_modifiers(scene.objects, group)
+
+def remove_wiggle_modifiers(scene):
+    for obj in scene.objects:
+        modifier = obj.modifiers.get(WIGGLE_MODIFIER) if obj.type == 'MESH' else None
+        if modifier is not None:
+            obj.modifiers.remove(modifier)
+
+def active_region_3d():
+    """Vista 3D de la que se toma el frustum (la primera que haya en pantalla)."""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                return area.spaces.active.region_3d
+    return None
+
+def frustum_planes(perspective_matrix):
+    """Los 6 planos del frustum (normalizados) a partir de la matriz de perspectiva."""
+    m = np.array(perspective_matrix, dtype=np.float64)
+    planes = np.array([m[3] + m[0], m[3] - m[0], m[3] + m[1], m[3] - m[1], m[3] + m[2], m[3] - m[2]])
+    return planes / np.linalg.norm(planes[:, :3], axis=1)[:, None]
+
+def culling_candidates(scene):
+    """Mallas de la escena y su posición en scene.objects (se recalculan solo si cambió el conjunto).
+
+    En vista previa, las mallas añadidas desde la última vez reciben aquí el modificador.
+    """
+    global culling_objects, culling_indices, culling_key, culling_rebuild, preview_visible
+    key = (scene.session_uid, len(scene.objects))
+    if culling_rebuild or key != culling_key:
+        objects = list(scene.objects)
+        culling_indices = np.array([index for index, obj in enumerate(objects) if obj.type == 'MESH'], dtype=np.int64)
+        culling_objects = [objects[index] for index in culling_indices.tolist()]
+        if scene.wiggle_mode == 'PREVIEW':
+            attach_wiggle_modifiers(culling_objects, wiggle_node_group())
+        culling_key = key
+        culling_rebuild = False
+        preview_visible = None
+    return culling_objects, culling_indices
+
+def world_bounding_spheres(scene, indices):
+    """Centros y radios en mundo de los objetos ``indices`` de scene.objects.
+
+    Matrices y cajas envolventes se leen con un foreach_get para toda la escena.
+    """
+    count = len(scene.objects)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    corners = np.empty(count * 24, dtype=np.float32)
+    scene.objects.foreach_get("matrix_world", matrices)
+    scene.objects.foreach_get("bound_box", corners)
+    # foreach_get entrega las matrices por columnas
+    matrices = matrices.reshape(-1, 4, 4).transpose(0, 2, 1)[indices].astype(np.float64)
+    corners = corners.reshape(-1, 8, 3)[indices].astype(np.float64)
+    local_centers = corners.mean(axis=1)
+    local_radii = np.linalg.norm(corners - local_centers[:, None], axis=2).max(axis=1)
+    centers = np.einsum('nij,nj->ni', matrices[:, :3, :3], local_centers) + matrices[:, :3, 3]
+    radii = local_radii * np.linalg.norm(matrices[:, :3, :3], axis=1).max(axis=1)
+    return centers, radii
+
+def cull_objects(scene, indices):
+    """Máscara de los objetos ``indices`` dentro del frustum de la vista 3D y a menos de wiggle_max_distance."""
+    region_3d = active_region_3d()
+    if not scene.wiggle_culling or region_3d is None or not len(indices):
+        return np.ones(len(indices), dtype=bool)
+    centers, radii = world_bounding_spheres(scene, indices)
+    planes = frustum_planes(region_3d.perspective_matrix)
+    inside = (planes[:, :3] @ centers.T + planes[:, 3:] >= -radii).all(axis=0)
+    eye = np.array(region_3d.view_matrix.inverted().translation, dtype=np.float64)
+    inside &= np.linalg.norm(centers - eye, axis=1) - radii <= scene.wiggle_max_distance
+    return inside
+
+def refresh_scheduled_objects(scene):
+    """Recalcula qué objetos se animan; en vista previa apaga el modificador de los demás.
+
+    Todo el trabajo por objeto está en bloque (foreach_get y NumPy); en Python solo se
+    recorren los objetos visibles y los que cambiaron de visibilidad.
+    """
+    global scheduled_objects, visibility_time, preview_visible
+    objects, indices = culling_candidates(scene)
+    visible = cull_objects(scene, indices)
+    scheduled_objects = [objects[index] for index in np.flatnonzero(visible).tolist()]
+    visibility_time = time.perf_counter()
+
+    if scene.wiggle_mode != 'PREVIEW':
+        preview_visible = None
+        return
+    changed = np.arange(len(objects)) if preview_visible is None else np.flatnonzero(visible != preview_visible)
+    for index in changed.tolist():
+        obj = objects[index]
+        modifier = obj.modifiers.get(WIGGLE_MODIFIER)
+        # Solo se escribe cuando cambia, para no ensuciar objetos en cada refresco
+        if modifier is not None and modifier.show_viewport != bool(visible[index]):
+            modifier.show_viewport = bool(visible[index])
+    preview_visible = visible
+
+def wiggle_scheduled_objects(scene):
+    """Aplica el wiggle en ronda a los objetos visibles sin pasarse de wiggle_budget_ms por tick."""
+    global wiggle_cursor
+    count = len(scheduled_objects)
+    if not count:
+        return
+    budget = scene.wiggle_budget_ms / 1000
+    start_time = time.perf_counter()
+    done = 0
+    while done < count:
+        obj = scheduled_objects[(wiggle_cursor + done) % count]
+        done += 1
+        ps1_wiggle(obj, intensity=scene.wiggle_intensity, frame=jitter_frame, seed=scene.wiggle_seed)
+        if time.perf_counter() - start_time > budget:
+            break
+    wiggle_cursor = (wiggle_cursor + done) % count
+
+def run_wiggle_scheduler(scene):
+    """Refresca la visibilidad si toca y aplica el wiggle con el presupuesto por tick."""
+    global culling_rebuild
+    if time.perf_counter() - visibility_time > VISIBILITY_INTERVAL:
+        refresh_scheduled_objects(scene)
+    try:
+        wiggle_scheduled_objects(scene)
+    except ReferenceError:
+        # Un objeto de la lista se borró: se recalcula en el próximo tick
+        culling_rebuild = True
+        refresh_scheduled_objects(scene)
+
+def animation_playing():
+    return any(window.screen.is_animation_playing for window in bpy.context.window_manager.windows)
+
+def set_preview_seed(scene, frame):
+    """Una sola escritura: la semilla compartida del grupo de nodos."""
+    group = wiggle_node_group(create=False)
+    if group is not None:
+        group.nodes["Wiggle Seed"].integer = scene.wiggle_seed * JITTER_FRAMES + frame % JITTER_FRAMES
 
 def update_wiggle():
     """Actualiza el wiggle constantemente si está activado."""
+    global jitter_frame
     scene = bpy.context.scene
     if scene.wiggle_enabled:
-        if bpy.context.mode == 'OBJECT':
-            for obj in scene.objects:
-                ps1_wiggle(obj, intensity=scene.wiggle_intensity)
+        # Durante la reproducción manda el frame de la escena (wiggle_frame_change)
+        if animation_playing():
+            return 1/30
+        jitter_frame = (jitter_frame + 1) % JITTER_FRAMES
+        if scene.wiggle_mode == 'PREVIEW':
+            if time.perf_counter() - visibility_time > VISIBILITY_INTERVAL:
+                refresh_scheduled_objects(scene)
+            set_preview_seed(scene, jitter_frame)
+        elif bpy.context.mode == 'OBJECT':
+            run_wiggle_scheduler(scene)
         return 1/30  # 30 FPS
     else:
         return None
 
+def start_wiggle_timer():
+    """Registra el temporizador del wiggle una sola vez."""
+    global wiggle_timer, visibility_time, culling_rebuild
+    visibility_time = 0.0
+    culling_rebuild = True
+    if not bpy.app.timers.is_registered(update_wiggle):
+        bpy.app.timers.register(update_wiggle)
+    wiggle_timer = update_wiggle
+
+def stop_wiggle_timer():
+    global wiggle_timer
+    if bpy.app.timers.is_registered(update_wiggle):
+        bpy.app.timers.unregister(update_wiggle)
+    wiggle_timer = None
+
 def monitor_mode_change():
     """Monitorea el cambio de modo y gestiona la activación/desactivación del efecto."""
-    global wiggle_timer, previous_wiggle_state
+    global previous_wiggle_state
     scene = bpy.context.scene
 
+    # En vista previa el modificador ya se oculta en modo edición
+    if scene.wiggle_mode == 'PREVIEW':
+        return 1/10
     if bpy.context.mode != 'OBJECT':
         if scene.wiggle_enabled:
             previous_wiggle_state = True
@@ -73,42 +349,53 @@ def monitor_mode_change():
             for obj in scene.objects:
                 restore_original_positions(obj)
             scene.wiggle_enabled = False
-            if wiggle_timer is not None:
-                bpy.app.timers.unregister(update_wiggle)
-                wiggle_timer = None
+            stop_wiggle_timer()
             bpy.ops.object.mode_set(mode='EDIT')
     else:
         if previous_wiggle_state:
             scene.wiggle_enabled = True
             previous_wiggle_state = False
-            if wiggle_timer is None:
-                wiggle_timer = bpy.app.timers.register(update_wiggle)
+            start_wiggle_timer()
     return 1/10  # Verifica cada 0.1 segundos
 
-def check_geometry_integrity():
-    """Compara la cantidad de vértices actuales con los originales.
-    Retorna una lista de nombres de objetos que han cambiado."""
-    warnings = []
-    for obj_name, original_pos in original_vertices.items():
-        obj = bpy.data.objects.get(obj_name)
-        if obj is None or obj.type != 'MESH':
-            warnings.append(f"{obj_name} (ausente o no mesh)")
-        else:
-            if len(obj.data.vertices) != len(original_pos):
-                warnings.append(obj_name)
-    return warnings
+def set_wiggle_warning(scene, text):
+    """Solo escribe la propiedad si cambia (cada escritura provoca otro update)."""
+    if scene.wiggle_warning != text:
+        scene.wiggle_warning = text
 
-def geometry_update_handler(depsgraph):
-    """Handler que se ejecuta en cada actualización de la escena para detectar cambios en la geometría."""
-    scene = bpy.context.scene
-    if scene.wiggle_enabled:
-        warns = check_geometry_integrity()
-        if warns:
-            scene.wiggle_warning = "¡Advertencia! Objetos modificados: " + ", ".join(warns)
+@bpy.app.handlers.persistent
+def geometry_update_handler(scene, depsgraph):
+    """Handler que detecta cambios de geometría en los objetos con posiciones guardadas.
+
+    Solo mira los IDs de ``depsgraph.updates`` con geometría actualizada, e ignora los
+    que escribió el propio wiggle, así que su coste depende del cambio y no de la escena.
+    """
+    global culling_rebuild
+    written = wiggle_written.copy()
+    wiggle_written.clear()
+    # Objetos añadidos o borrados: la lista del recorte se recalcula en el próximo refresco
+    if depsgraph.id_type_updated('COLLECTION'):
+        culling_rebuild = True
+    if not scene.wiggle_enabled or scene.wiggle_mode != 'MESH':
+        modified_objects.clear()
+        set_wiggle_warning(scene, "")
+        return
+
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        obj = update.id.original
+        if not isinstance(obj, bpy.types.Object) or obj.type != 'MESH' or obj.data.session_uid in written:
+            continue
+        if snapshots.matches(obj.data):
+            modified_objects.pop(obj.session_uid, None)
         else:
-            scene.wiggle_warning = ""
+            modified_objects[obj.session_uid] = obj.name
+
+    if modified_objects:
+        set_wiggle_warning(scene, "¡Advertencia! Objetos modificados: " + ", ".join(modified_objects.values()))
     else:
-        scene.wiggle_warning = ""
+        set_wiggle_warning(scene, "")
 
 # Panel de interfaz en la barra lateral de Blender
 class SimpleWigglePanel(bpy.types.Panel):
@@ -122,7 +409,14 @@ class SimpleWigglePanel(bpy.types.Panel):
         layout = self.layout
         scene = context.scene
         layout.prop(scene, "wiggle_enabled", text="Enable PS1 Wiggle")
+        layout.prop(scene, "wiggle_mode", text="Mode")
         layout.prop(scene, "wiggle_intensity", text="Wiggle Intensity", slider=True)
+        layout.prop(scene, "wiggle_seed", text="Seed")
+        layout.prop(scene, "wiggle_culling", text="Only Visible Objects")
+        col = layout.column()
+        col.active = scene.wiggle_culling
+        col.prop(scene, "wiggle_max_distance", text="Max Distance")
+        layout.prop(scene, "wiggle_budget_ms", text="Budget per Tick (ms)")
         
         # Si hay una advertencia, la mostramos dentro de un cuadro amarillo
         if scene.wiggle_warning:
@@ -133,28 +427,102 @@ class SimpleWigglePanel(bpy.types.Panel):
 
 def toggle_wiggle(self, context):
     """Activa o desactiva el temporizador y guarda/restaura posiciones según corresponda."""
-    global wiggle_timer
     scene = context.scene
 
     if scene.wiggle_enabled:
-        for obj in scene.objects:
-            if obj.name not in original_vertices:
+        if scene.wiggle_mode == 'PREVIEW':
+            add_wiggle_modifiers(scene)
+        else:
+            for obj in scene.objects:
                 save_original_positions(obj)
-        if wiggle_timer is None:
-            wiggle_timer = bpy.app.timers.register(update_wiggle)
-        bpy.app.timers.register(monitor_mode_change)
+        start_wiggle_timer()
+        if not bpy.app.timers.is_registered(monitor_mode_change):
+            bpy.app.timers.register(monitor_mode_change)
     else:
+        remove_wiggle_modifiers(scene)
         for obj in scene.objects:
-            restore_original_positions(obj)
-        if wiggle_timer is not None:
-            bpy.app.timers.unregister(update_wiggle)
-            wiggle_timer = None
+            restore_original_positions(obj, forget=True)
+        jitter_tables.clear()
+        stop_wiggle_timer()
+
+def update_wiggle_mode(self, context):
+    """Cambia de modo con el wiggle activo: deshace el modo anterior y aplica el nuevo."""
+    scene = context.scene
+    if not scene.wiggle_enabled:
+        return
+    if scene.wiggle_mode == 'PREVIEW':
+        for obj in scene.objects:
+            restore_original_positions(obj, forget=True)
+        add_wiggle_modifiers(scene)
+    else:
+        remove_wiggle_modifiers(scene)
+        for obj in scene.objects:
+            save_original_positions(obj)
 
 def update_wiggle_intensity(self, context):
     """Forza la actualización al cambiar la intensidad."""
     if context.scene.wiggle_enabled:
-        bpy.app.timers.unregister(update_wiggle)
-        bpy.app.timers.register(update_wiggle)
+        group = wiggle_node_group(create=False)
+        if group is not None:
+            group.nodes["Wiggle Intensity"].outputs[0].default_value = context.scene.wiggle_intensity
+        stop_wiggle_timer()
+        start_wiggle_timer()
+
+@bpy.app.handlers.persistent
+def wiggle_frame_change(scene, depsgraph=None):
+    """Al cambiar de frame (reproducción o render de secuencias) el ruido sale de frame_current.
+
+    En un render se aplican todos los objetos, sin recorte ni presupuesto, para que cada
+    frame sea completo y reproducible; en la reproducción el modo Mesh pasa por el mismo
+    planificador que el temporizador.
+    """
+    global jitter_frame
+    if not scene.wiggle_enabled:
+        return
+    jitter_frame = scene.frame_current % JITTER_FRAMES
+    if scene.wiggle_mode == 'PREVIEW':
+        set_preview_seed(scene, jitter_frame)
+    elif bpy.context.mode != 'OBJECT':
+        return
+    elif rendering:
+        for obj in scene.objects:
+            ps1_wiggle(obj, intensity=scene.wiggle_intensity, frame=jitter_frame, seed=scene.wiggle_seed)
+    else:
+        run_wiggle_scheduler(scene)
+
+@bpy.app.handlers.persistent
+def wiggle_render_start(*args):
+    global rendering
+    rendering = True
+
+@bpy.app.handlers.persistent
+def wiggle_render_end(*args):
+    global rendering
+    rendering = False
+
+@bpy.app.handlers.persistent
+def wiggle_save_pre(dummy):
+    """Nunca guarda el efecto: quita los modificadores o restaura las posiciones originales."""
+    scene = bpy.context.scene
+    if scene is None or not scene.wiggle_enabled:
+        return
+    remove_wiggle_modifiers(scene)
+    for obj in scene.objects:
+        restore_original_positions(obj)
+
+@bpy.app.handlers.persistent
+def wiggle_save_post(dummy):
+    scene = bpy.context.scene
+    if scene is not None and scene.wiggle_enabled and scene.wiggle_mode == 'PREVIEW':
+        add_wiggle_modifiers(scene)
+
+@bpy.app.handlers.persistent
+def wiggle_load_post(dummy):
+    """Un archivo guardado con el wiggle activo lo retoma al abrirse."""
+    jitter_tables.clear()
+    scene = bpy.context.scene
+    if scene is not None and scene.wiggle_enabled:
+        toggle_wiggle(scene, bpy.context)
 
 def register():
     bpy.types.Scene.wiggle_enabled = bpy.props.BoolProperty(
@@ -172,6 +540,40 @@ def register():
         step=0.0001,
         update=update_wiggle_intensity
     )
+    bpy.types.Scene.wiggle_mode = bpy.props.EnumProperty(
+        name="Wiggle Mode",
+        description="Cómo se aplica el efecto PS1 Wiggle",
+        items=[
+            ('PREVIEW', "Preview", "Modificador de geometry nodes: la malla original nunca se modifica"),
+            ('MESH', "Mesh", "Escribe las posiciones en la malla y las restaura al desactivar"),
+        ],
+        default='PREVIEW',
+        update=update_wiggle_mode
+    )
+    bpy.types.Scene.wiggle_seed = bpy.props.IntProperty(
+        name="Wiggle Seed",
+        description="Semilla de las tablas de jitter: la misma semilla repite el mismo wiggle en cada frame",
+        default=0,
+        min=0
+    )
+    bpy.types.Scene.wiggle_culling = bpy.props.BoolProperty(
+        name="Only Visible Objects",
+        description="Anima solo los objetos dentro de la vista 3D y a menos de la distancia máxima",
+        default=True
+    )
+    bpy.types.Scene.wiggle_max_distance = bpy.props.FloatProperty(
+        name="Max Distance",
+        description="Distancia a la cámara de la vista a partir de la cual no se aplica el wiggle",
+        default=300.0,
+        min=0.0
+    )
+    bpy.types.Scene.wiggle_budget_ms = bpy.props.FloatProperty(
+        name="Budget per Tick",
+        description="Milisegundos máximos por tick en modo Mesh; el resto de objetos sigue en el siguiente tick",
+        default=4.0,
+        min=0.1,
+        max=33.0
+    )
     # Propiedad para mostrar mensajes de advertencia en la interfaz
     bpy.types.Scene.wiggle_warning = bpy.props.StringProperty(
         name="Wiggle Warning",
@@ -179,20 +581,43 @@ def register():
     )
     bpy.utils.register_class(SimpleWigglePanel)
     # Registra el handler para monitorizar cambios en la geometría
-    bpy.app.handlers.depsgraph_update_post.append(geometry_update_handler)
+    if geometry_update_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(geometry_update_handler)
+    for handlers, handler in ((bpy.app.handlers.save_pre, wiggle_save_pre),
+                              (bpy.app.handlers.save_post, wiggle_save_post),
+                              (bpy.app.handlers.load_post, wiggle_load_post),
+                              (bpy.app.handlers.frame_change_post, wiggle_frame_change),
+                              (bpy.app.handlers.render_init, wiggle_render_start),
+                              (bpy.app.handlers.render_complete, wiggle_render_end),
+                              (bpy.app.handlers.render_cancel, wiggle_render_end)):
+        if handler not in handlers:
+            handlers.append(handler)
 
 def unregister():
-    global wiggle_timer
-    if wiggle_timer is not None:
-        bpy.app.timers.unregister(update_wiggle)
-        wiggle_timer = None
+    stop_wiggle_timer()
+    if bpy.app.timers.is_registered(monitor_mode_change):
+        bpy.app.timers.unregister(monitor_mode_change)
     bpy.utils.unregister_class(SimpleWigglePanel)
     del bpy.types.Scene.wiggle_enabled
     del bpy.types.Scene.wiggle_intensity
+    del bpy.types.Scene.wiggle_mode
+    del bpy.types.Scene.wiggle_seed
+    del bpy.types.Scene.wiggle_culling
+    del bpy.types.Scene.wiggle_max_distance
+    del bpy.types.Scene.wiggle_budget_ms
     del bpy.types.Scene.wiggle_warning
     # Remueve el handler de actualización de geometría
     if geometry_update_handler in bpy.app.handlers.depsgraph_update_post:
         bpy.app.handlers.depsgraph_update_post.remove(geometry_update_handler)
+    for handlers, handler in ((bpy.app.handlers.save_pre, wiggle_save_pre),
+                              (bpy.app.handlers.save_post, wiggle_save_post),
+                              (bpy.app.handlers.load_post, wiggle_load_post),
+                              (bpy.app.handlers.frame_change_post, wiggle_frame_change),
+                              (bpy.app.handlers.render_init, wiggle_render_start),
+                              (bpy.app.handlers.render_complete, wiggle_render_end),
+                              (bpy.app.handlers.render_cancel, wiggle_render_end)):
+        if handler in handlers:
+            handlers.remove(handler)
 
 if __name__ == "__main__":
     register()
@@ -4,6 +4,9 @@ import json
 import os
 import bpy_extras.io_utils  # Import ExportHelper to manage .json files
 
+from .uv_sequence_format import (DEFAULT_TEXEL_SCALE, ENCODING_FLOAT32, ENCODING_UINT16,
+                                 EXTENSION as SEQUENCE_EXTENSION, write_uv_sequence)
+
 uvs_storage = {}  # Stores UV data for each object
 active_uvs_list = None
 first_object_name = None
@@ -108,12 +111,55 @@ class UV_OT_PrintSelectedUVs(bpy.types.Operator):
         return {'FINISHED'}
 
 class UV_OT_ExportAnimationInfo(bpy.types.Operator, bpy_extras.io_utils.ExportHelper):
-    """Export all stored UV data to a JSON file"""
+    """Export all stored UV data to a JSON or binary (.rtuv) file"""
     bl_idname = "uv.export_animation_info"
     bl_label = "Export Animation Info"
     bl_options = {'REGISTER', 'UNDO'}
 
     filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json;*" + SEQUENCE_EXTENSION, options={'HIDDEN'})
+
+    file_format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ('JSON', "JSON", "Readable JSON file"),
+            ('BINARY', "Binary", "Compact memory-mappable file (" + SEQUENCE_EXTENSION + ")"),
+        ],
+        default='JSON',
+    )
+    uv_encoding: bpy.props.EnumProperty(
+        name="UV Encoding",
+        items=[
+            ('FLOAT32', "Float32", "Exact UVs"),
+            ('UINT16', "UInt16", "UVs quantized to the texel scale, half the size"),
+        ],
+        default='FLOAT32',
+    )
+    texel_scale: bpy.props.FloatProperty(
+        name="Texel Scale",
+        description="Quantization steps per UV unit for the UInt16 encoding",
+        default=DEFAULT_TEXEL_SCALE,
+        min=1.0,
+    )
+
+    def file_extension(self):
+        return SEQUENCE_EXTENSION if self.file_format == 'BINARY' else ".json"
+
+    def check(self, context):
+        # Keep the extension in sync with the chosen format
+        filepath = bpy.path.ensure_ext(os.path.splitext(self.filepath)[0], self.file_extension())
+        if filepath != self.filepath:
+            self.filepath = filepath
+            return True
+        return False
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "file_format")
+        if self.file_format == 'BINARY':
+            layout.prop(self, "uv_encoding")
+            if self.uv_encoding == 'UINT16':
+                layout.prop(self, "texel_scale")
 
     def execute(self, context):
         global uvs_storage
@@ -127,6 +173,17 @@ class UV_OT_ExportAnimationInfo(bpy.types.Operator, bpy_extras.io_utils.ExportHe
                 if "Texture" in frame_data and frame_data["Texture"] != "No Texture":
                     frame_data["Texture"] = frame_data["Texture"].replace("\\", "/")
 
+        self.filepath = bpy.path.ensure_ext(os.path.splitext(self.filepath)[0], self.file_extension())
+        if self.file_format == 'BINARY':
+            encoding = ENCODING_UINT16 if self.uv_encoding == 'UINT16' else ENCODING_FLOAT32
+            try:
+                write_uv_sequence(self.filepath, uvs_storage, encoding, self.texel_scale)
+            except ValueError as e:
+                self.report({'ERROR'}, str(e))
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"UV data exported to {self.filepath}")
+            return {'FINISHED'}
+
         data_to_export = json.dumps(uvs_storage, indent=4)
 
         with open(self.filepath, "w", encoding="utf-8") as file:
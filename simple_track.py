@@ -1,5 +1,7 @@
 import bpy
 
+from .psx_wiggle import WIGGLE_MODIFIER
+
 # Function to create a circle (as a curve) with subdivisions and specific scale
 def create_road(self, context, subdivisions, scale_factor, road_name):
     bpy.ops.curve.primitive_bezier_circle_add(radius=5, location=(0, 0, 0))
@@ -95,9 +97,9 @@ def finish_process(self, context):
         self.report({'WARNING'}, "No object found")
         return {'CANCELLED'}
     obj = bpy.context.active_object
-    if obj.modifiers:
-        for modifier in obj.modifiers:
-            bpy.ops.object.modifier_apply(modifier=modifier.name)
+    # The PS1 wiggle preview modifier is never baked into the mesh
+    for name in [modifier.name for modifier in obj.modifiers if modifier.name != WIGGLE_MODIFIER]:
+        bpy.ops.object.modifier_apply(modifier=name)
     obj.select_set(True)
     bpy.ops.mesh.separate(type='LOOSE')
     return {'FINISHED'}
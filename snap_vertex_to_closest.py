@@ -1,6 +1,8 @@
 import bpy
-import bmesh
-from mathutils import Vector, kdtree
+import numpy as np
+
+from .Find_invalid_data import connected_components, transform_coordinates
+from .spatial_index import vertex_index
 
 # -------------------------------
 # Operator: Activate Snap (Closest/Vertex)
@@ -46,47 +48,200 @@ class SnapVertexToClosestOperator(bpy.types.Operator):
 
         active_object = selected_objects[0]
         reference_objects = selected_objects[1:]
+        # Edit mode changes reach the mesh only now, after the index last saw it
+        vertex_index.invalidate(obj for obj in selected_objects if obj.mode == 'EDIT')
         bpy.ops.object.mode_set(mode='OBJECT')
 
-        # Get the global coordinates of reference vertices
-        reference_vertices_global = []
-        for ref_obj in reference_objects:
-            reference_vertices_global.extend([ref_obj.matrix_world @ v.co for v in ref_obj.data.vertices])
-        if not reference_vertices_global:
+        # Reference vertices come from the shared scene index (only stale objects are re-read)
+        if not sum(len(ref_obj.data.vertices) for ref_obj in reference_objects):
             self.report({'WARNING'}, "No vertices found in the reference objects.")
             return {'CANCELLED'}
 
         # Process the selected vertices of the active object
-        bm = bmesh.new()
-        bm.from_mesh(active_object.data)
-        selected_vertices = [v for v in bm.verts if v.select]
-        if not selected_vertices:
-            bm.free()
+        mesh = active_object.data
+        selected = np.zeros(len(mesh.vertices), dtype=bool)
+        mesh.vertices.foreach_get("select", selected)
+        if not selected.any():
             self.report({'WARNING'}, "No vertices selected in the active object.")
             return {'CANCELLED'}
 
-        for v in selected_vertices:
-            global_v_co = active_object.matrix_world @ v.co
-            closest_vertex_global = min(reference_vertices_global, key=lambda v2_co: (global_v_co - v2_co).length)
-            local_closest_co = active_object.matrix_world.inverted() @ closest_vertex_global
-            v.co = local_closest_co
+        # The object about to be written is always re-read, in case a script changed it
+        # after the index last saw it
+        vertex_index.invalidate([active_object])
+        _, _, matrices, world = vertex_index.gather([active_object])
+        closest, _ = vertex_index.nearest(world[selected], reference_objects)
 
-        bm.to_mesh(active_object.data)
-        bm.free()
-        active_object.data.update()
+        moved = transform_coordinates(closest, np.array([len(closest)]), np.linalg.inv(matrices))
+        write_vertices(active_object, np.flatnonzero(selected), moved)
+        vertex_index.invalidate([active_object])
 
         self.report({'INFO'}, "Vertices adjusted successfully.")
         return {'FINISHED'}
 
 # -------------------------------
-# Operator: Attach by Distance (Optimized with KDTree)
+# Vectorized Attach by Distance engine
+# -------------------------------
+# Vertices closer than this are considered already snapped
+SNAP_EPSILON = 1e-6
+
+
+def write_vertices(obj, indices, coordinates):
+    """Writes local ``coordinates`` to the vertices ``indices`` of ``obj``.
+
+    The rest of the mesh is read back from the mesh itself, not from the index, so
+    edits the index has not seen yet are kept.
+    """
+    mesh = obj.data
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    co[indices] = coordinates
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.update()
+
+
+def limit_cluster_diameter(world, labels, max_diameter, units):
+    """Splits the clusters whose bounding box is wider than ``max_diameter``.
+
+    Chained clusters (a whole row of blocks linked pair by pair) are regrown from
+    seeds: the lowest unassigned vertex takes every unassigned vertex of its cluster
+    within ``max_diameter / 2``, so no resulting cluster is wider. ``units`` labels
+    groups of vertices closer than SNAP_EPSILON (smallest index of each group); a
+    group is assigned as a whole by its first vertex, so it is never separated.
+    Returns new labels, again the smallest vertex index of each cluster.
+    """
+    groups, inverse = np.unique(labels, return_inverse=True)
+    inverse = inverse.ravel()
+    mins = np.full((len(groups), 3), np.inf)
+    maxs = np.full((len(groups), 3), -np.inf)
+    np.minimum.at(mins, inverse, world)
+    np.maximum.at(maxs, inverse, world)
+    too_wide = np.flatnonzero(np.linalg.norm(maxs - mins, axis=1) > max_diameter)
+    if not len(too_wide):
+        return labels
+
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.searchsorted(inverse[order], np.stack((too_wide, too_wide + 1)))
+    labels = labels.copy()
+    seeds = np.arange(len(world))
+    radius = max_diameter / 2
+    for start, stop in zip(*bounds.tolist()):
+        members = order[start:stop]
+        heads = members[units[members] == members]
+        positions = world[heads]
+        assigned = np.zeros(len(heads), dtype=bool)
+        for index in range(len(heads)):
+            if assigned[index]:
+                continue
+            taken = ~assigned & (np.linalg.norm(positions - positions[index], axis=1) <= radius)
+            assigned |= taken
+            seeds[heads[taken]] = heads[index]
+        labels[members] = seeds[units[members]]
+    return labels
+
+
+def nearest_anchor_targets(world, labels, is_anchor):
+    """Target of every vertex in ANCHOR mode.
+
+    Anchor vertices stay where they are; every other vertex goes to the closest anchor
+    vertex of its cluster, and clusters without anchor vertices are left alone.
+    Candidates are the (vertex, anchor vertex) pairs of each cluster, so the work is
+    the sum over clusters of their vertex count times their anchor count.
+    """
+    target = world.copy()
+    anchors = np.flatnonzero(is_anchor)
+    anchors = anchors[np.argsort(labels[anchors], kind='stable')]
+    anchor_labels = labels[anchors]
+    followers = np.flatnonzero(~is_anchor)
+    starts = np.searchsorted(anchor_labels, labels[followers], side='left')
+    sizes = np.searchsorted(anchor_labels, labels[followers], side='right') - starts
+    has_anchor = sizes > 0
+    followers, starts, sizes = followers[has_anchor], starts[has_anchor], sizes[has_anchor]
+    if not len(followers):
+        return target
+
+    first_pair = np.cumsum(sizes) - sizes
+    pair_follower = np.repeat(np.arange(len(followers)), sizes)
+    pair_anchor = anchors[np.repeat(starts - first_pair, sizes) + np.arange(int(sizes.sum()))]
+    distances = np.linalg.norm(world[followers[pair_follower]] - world[pair_anchor], axis=1)
+    # Pairs sorted by vertex and then distance: the first pair of each vertex is its closest
+    order = np.lexsort((distances, pair_follower))
+    target[followers] = world[pair_anchor[order[first_pair]]]
+    return target
+
+
+def attach_by_distance(objects, threshold, mode='FIRST', max_diameter=0.0, anchor=None, dry_run=False):
+    """Snaps vertices of separate objects that are within ``threshold`` of each other.
+
+    World coordinates and close pairs come from the shared scene index and its grid
+    (only objects changed since the last query are re-read), are clustered with
+    connected components and written back per object with foreach_set.
+
+    ``mode`` picks the position of each cluster: 'FIRST' (its first vertex),
+    'CENTROID' (the mean of its vertices) or 'ANCHOR' (the vertices of ``anchor``
+    stay fixed and the rest snap to the closest of them in the cluster; clusters
+    without anchor vertices are left alone).
+    ``max_diameter`` > 0 splits clusters wider than that. With ``dry_run`` nothing is
+    written. Returns a dict with the moved vertex count and the largest displacement,
+    or None if there are no vertices.
+    """
+    local, counts, matrices, world = vertex_index.gather(objects)
+    if not len(local):
+        return None
+
+    first, second = vertex_index.neighbour_pairs(objects, threshold)
+    labels = connected_components(len(world), first, second)
+    if max_diameter > 0:
+        coincident = np.linalg.norm(world[first] - world[second], axis=1) <= SNAP_EPSILON
+        units = connected_components(len(world), first[coincident], second[coincident])
+        labels = limit_cluster_diameter(world, labels, max_diameter, units)
+
+    if mode == 'FIRST':
+        target = world[labels]
+    elif mode == 'ANCHOR':
+        owner = np.repeat(np.arange(len(objects)), counts)
+        target = nearest_anchor_targets(world, labels, owner == objects.index(anchor))
+    else:
+        totals = np.bincount(labels, minlength=len(world))
+        sums = np.stack([np.bincount(labels, weights=world[:, axis], minlength=len(world))
+                         for axis in range(3)], axis=1)
+        target = sums[labels] / totals[labels, None]
+
+    displacement = np.linalg.norm(world - target, axis=1)
+    moved = displacement > SNAP_EPSILON
+    result = {
+        "moved": int(moved.sum()),
+        "max_displacement": float(displacement.max()),
+        "clusters": len(np.unique(labels[moved])),
+    }
+    if dry_run or not moved.any():
+        return result
+
+    new_local = transform_coordinates(target, counts, np.linalg.inv(matrices))
+
+    # Only the moved vertices are written, so the cached coordinates never replace the mesh
+    offsets = np.cumsum(counts) - counts
+    owner = np.repeat(np.arange(len(objects)), counts)
+    changed = np.unique(owner[moved]).tolist()
+    for index in changed:
+        start, count = offsets[index], counts[index]
+        indices = np.flatnonzero(moved[start:start + count])
+        write_vertices(objects[index], indices, new_local[start + indices])
+    vertex_index.invalidate(objects[index] for index in changed)
+    return result
+
+# -------------------------------
+# Operator: Attach by Distance (Vectorized)
 # -------------------------------
 class AttachByDistanceOperator(bpy.types.Operator):
     """Snaps vertices of separate objects without merging them, based on a distance threshold.
 
     Collects all vertices from selected MESH objects and groups those within 
     the specified threshold. If a group has vertices that do not yet share 
-    the same position, they snap to the position of a representative vertex.
+    the same position, they snap to the first vertex, the centroid of the group or
+    the vertices of an anchor object. Groups can be limited in size, and a dry run
+    reports the moves without changing the meshes.
+    The work is done by the vectorized attach_by_distance engine.
     """
     bl_idname = "view3d.attach_by_distance_operator"
     bl_label = "Attach by Distance"
@@ -97,10 +252,46 @@ class AttachByDistanceOperator(bpy.types.Operator):
         default=0.1,
         min=0.0
     )
+    snap_mode: bpy.props.EnumProperty(
+        name="Snap To",
+        description="Position every group of close vertices snaps to",
+        items=[
+            ('FIRST', "First Vertex", "Position of the first vertex of the group"),
+            ('CENTROID', "Centroid", "Average position of the group"),
+            ('ANCHOR', "Anchor Object", "Vertices of the anchor object stay in place and the rest snap to them"),
+        ],
+        default='FIRST'
+    )
+    max_diameter: bpy.props.FloatProperty(
+        name="Max Group Size",
+        description="Split groups wider than this, so close pairs cannot chain along a row of blocks (0 = no limit)",
+        default=0.0,
+        min=0.0
+    )
+    anchor_object: bpy.props.StringProperty(
+        name="Anchor Object",
+        description="Object whose vertices stay in place in Anchor Object mode"
+    )
+    dry_run: bpy.props.BoolProperty(
+        name="Dry Run",
+        description="Only report how many vertices would move, without changing the meshes",
+        default=False
+    )
 
     def invoke(self, context, event):
+        if not self.anchor_object and context.active_object:
+            self.anchor_object = context.active_object.name
         return context.window_manager.invoke_props_dialog(self)
 
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "distance_threshold")
+        layout.prop(self, "snap_mode")
+        if self.snap_mode == 'ANCHOR':
+            layout.prop_search(self, "anchor_object", context.scene, "objects")
+        layout.prop(self, "max_diameter")
+        layout.prop(self, "dry_run")
+
     def execute(self, context):
         # Collect all selected MESH objects
         selected_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
@@ -108,91 +299,26 @@ class AttachByDistanceOperator(bpy.types.Operator):
             self.report({'WARNING'}, "No mesh objects selected.")
             return {'CANCELLED'}
 
+        anchor = bpy.data.objects.get(self.anchor_object)
+        if self.snap_mode == 'ANCHOR' and anchor not in selected_objects:
+            self.report({'WARNING'}, "The anchor object must be one of the selected meshes.")
+            return {'CANCELLED'}
+
+        vertex_index.invalidate(obj for obj in selected_objects if obj.mode == 'EDIT')
         bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # Prepare a dictionary with the bmesh of each object and a global list of vertices
-        bm_dict = {}
-        global_verts = []  # List of tuples: (global_co, (obj, bm_vert))
-
-        for obj in selected_objects:
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            bm.verts.ensure_lookup_table()
-            bm_dict[obj] = bm
-            for v in bm.verts:
-                global_co = obj.matrix_world @ v.co
-                global_verts.append((global_co, (obj, v)))
-
-        n = len(global_verts)
-        if n == 0:
+
+        result = attach_by_distance(selected_objects, self.distance_threshold, self.snap_mode,
+                                    self.max_diameter, anchor, self.dry_run)
+        if result is None:
             self.report({'WARNING'}, "No vertices found.")
             return {'CANCELLED'}
 
-        parent = list(range(n))
-
-        # Union-Find functions to group vertices
-        def find(i):
-            while parent[i] != i:
-                parent[i] = parent[parent[i]]
-                i = parent[i]
-            return i
-
-        def union(i, j):
-            root_i = find(i)
-            root_j = find(j)
-            if root_i != root_j:
-                parent[root_j] = root_i
-
-        thresh = self.distance_threshold
-        epsilon = 1e-6
-
-        # Create KDTree for efficient neighbor searching
-        kd = kdtree.KDTree(n)
-        for i, (co, _) in enumerate(global_verts):
-            kd.insert(co, i)
-        kd.balance()
-
-        # Use KDTree to find neighbors within the threshold
-        for i, (co, _) in enumerate(global_verts):
-            for (_, j, dist) in kd.find_range(co, thresh):
-                if i != j:
-                    union(i, j)
-
-        # Organize clusters in a dictionary: id_cluster -> list of indices
-        clusters = {}
-        for i in range(n):
-            root = find(i)
-            clusters.setdefault(root, []).append(i)
-
-        changes = 0
-        # Process each cluster with more than one vertex
-        for cluster_indices in clusters.values():
-            if len(cluster_indices) < 2:
-                continue  # Isolated vertex; do nothing
-
-            # Choose a representative position (e.g., the first vertex in the group)
-            rep_co = global_verts[cluster_indices[0]][0]
-
-            # Check if the cluster is already snapped (all positions nearly identical)
-            already_snapped = all((global_verts[idx][0] - rep_co).length <= epsilon for idx in cluster_indices)
-            if already_snapped:
-                continue
-
-            # Update the position of each vertex in the cluster to match the representative
-            for idx in cluster_indices:
-                _, (obj, bm_vert) = global_verts[idx]
-                new_local_co = obj.matrix_world.inverted() @ rep_co
-                if (bm_vert.co - new_local_co).length > epsilon:
-                    bm_vert.co = new_local_co
-                    changes += 1
-
-        # Write changes to each object and free bmesh
-        for obj, bm in bm_dict.items():
-            bm.to_mesh(obj.data)
-            bm.free()
-            obj.data.update()
-
-        self.report({'INFO'}, f"Attached vertices by distance (threshold {self.distance_threshold}). {changes} vertices moved.")
+        summary = (f"{result['moved']} vertices in {result['clusters']} groups, "
+                   f"max displacement {result['max_displacement']:.4f}")
+        if self.dry_run:
+            self.report({'INFO'}, f"Dry run (threshold {self.distance_threshold}): {summary} would move.")
+        else:
+            self.report({'INFO'}, f"Attached vertices by distance (threshold {self.distance_threshold}). {summary} moved.")
         return {'FINISHED'}
 
 # -------------------------------
@@ -0,0 +1,330 @@
+import bpy
+import numpy as np
+
+from collections import OrderedDict
+
+from .Find_invalid_data import (HALF_NEIGHBOURHOOD, gather_local_coordinates, is_mesh_edit, transform_coordinates,
+                                world_matrices)
+from .track_budget import track_objects
+
+# Points compared against every vertex at once when nearest() falls back to brute force
+QUERY_CHUNK = 64
+# Bits per axis of a packed cell key. Cells 2**21 apart share a key, which only adds
+# candidates that the distance test discards.
+CELL_BITS = 21
+CELL_MASK = (1 << CELL_BITS) - 1
+MIN_CELL_SIZE = 1e-6
+# Grids kept at once (one per cell size: the levels of nearest() and each attach threshold)
+MAX_GRIDS = 8
+# Cell size ratio between the grid levels searched by nearest()
+COARSEN_FACTOR = 4
+FULL_NEIGHBOURHOOD = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+
+def cell_coordinates(points, cell_size):
+    return np.floor(points / cell_size).astype(np.int64)
+
+
+def pack_cells(cells):
+    """One int64 key per cell, independent of the extent of the data (coordinates wrap at 2**21)."""
+    cells = cells & CELL_MASK
+    return (cells[..., 0] << (2 * CELL_BITS)) | (cells[..., 1] << CELL_BITS) | cells[..., 2]
+
+
+def neighbour_keys(keys, offset):
+    """Keys of the cells at ``offset`` of the cells ``keys`` (the wrap keeps it consistent)."""
+    cells = np.stack((keys >> (2 * CELL_BITS), keys >> CELL_BITS, keys), axis=-1) & CELL_MASK
+    return pack_cells(cells + np.array(offset))
+
+
+def expand_ranges(start, count):
+    """Owner and position of every element of the ranges [start, start + count)."""
+    total = int(count.sum())
+    owner = np.repeat(np.arange(len(count)), count)
+    return owner, np.repeat(start, count) + np.arange(total) - np.repeat(np.cumsum(count) - count, count)
+
+
+class CellGrid:
+    """Sorted cell table over a set of world coordinates (uniform grid, hashed cells)."""
+
+    def __init__(self, world, keys, cell_size):
+        self.world = world
+        self.cell_size = cell_size
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            keys[self.order], return_index=True, return_counts=True)
+
+    def find_cells(self, keys):
+        """Index in the table of each key and whether it is occupied."""
+        if not len(self.cell_keys):
+            return np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+        found = np.minimum(np.searchsorted(self.cell_keys, keys), len(self.cell_keys) - 1)
+        return found, self.cell_keys[found] == keys
+
+    def closest(self, points):
+        """Closest vertex among the 27 cells around each point: (positions, distances).
+
+        Points without candidates get NaN and an infinite distance. A result farther
+        than one cell may be beaten by a vertex outside the searched cells.
+        """
+        positions = np.full(points.shape, np.nan)
+        distances = np.full(len(points), np.inf)
+        query_keys, inverse = np.unique(pack_cells(cell_coordinates(points, self.cell_size)), return_inverse=True)
+        inverse = inverse.ravel()
+
+        point_parts, vertex_parts = [], []
+        for offset in FULL_NEIGHBOURHOOD:
+            found, hit = self.find_cells(neighbour_keys(query_keys, offset))
+            found, hit = found[inverse], hit[inverse]
+            point, position = expand_ranges(self.cell_start[found], np.where(hit, self.cell_count[found], 0))
+            point_parts.append(point)
+            vertex_parts.append(self.order[position])
+        point = np.concatenate(point_parts)
+        vertex = np.concatenate(vertex_parts)
+        if not len(point):
+            return positions, distances
+
+        squared = ((points[point] - self.world[vertex]) ** 2).sum(axis=1)
+        order = np.lexsort((squared, point))
+        best = order[np.flatnonzero(np.diff(point[order], prepend=-1))]
+        positions[point[best]] = self.world[vertex[best]]
+        distances[point[best]] = np.sqrt(squared[best])
+        return positions, distances
+
+    def pairs(self, radius):
+        """Pairs (i, j), i < j, of vertices at most ``radius`` apart (``radius`` <= cell size).
+
+        Searches are done per occupied cell and only towards half of the neighbours,
+        like grid_neighbour_pairs. A pair may be repeated when hashed cells collide.
+        """
+        first, second = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for offset in HALF_NEIGHBOURHOOD:
+            found, hit = self.find_cells(neighbour_keys(self.cell_keys, offset))
+            source = np.flatnonzero(hit)
+            target = found[source]
+            # Every combination of vertices between the two cells
+            pair_count = self.cell_count[source] * self.cell_count[target]
+            pair, step = expand_ranges(np.zeros(len(source), dtype=np.int64), pair_count)
+            width = self.cell_count[target][pair]
+            a = self.order[self.cell_start[source][pair] + step // width]
+            b = self.order[self.cell_start[target][pair] + step % width]
+            keep = a < b if offset == (0, 0, 0) else a != b
+            a, b = a[keep], b[keep]
+            close = ((self.world[a] - self.world[b]) ** 2).sum(axis=1) <= radius * radius
+            first.append(np.minimum(a[close], b[close]))
+            second.append(np.maximum(a[close], b[close]))
+        return np.concatenate(first), np.concatenate(second)
+
+
+class VertexSpatialIndex:
+    """Scene-wide store of mesh vertices in world space, refreshed incrementally.
+
+    Every indexed object keeps its local coordinates, its matrix_world and the derived
+    world coordinates. A depsgraph handler marks only the objects whose mesh or
+    transform changed; those are re-read on the next query and the rest is reused,
+    so the snapping operators pay for a query instead of a rebuild.
+
+    Queries go through uniform grids (one per cell size) that keep the cell keys of
+    every object and a sorted cell table; keys are recomputed only for re-read
+    objects and the table only when the queried objects change.
+    """
+
+    def __init__(self):
+        # object session_uid -> (mesh session_uid, local coords, matrix, world coords)
+        self.entries = {}
+        # mesh session_uid -> set of object session_uids using it
+        self.mesh_users = {}
+        self.dirty = set()
+        # cell size -> {"keys": {object session_uid: packed cell keys}, "table": (object uids, CellGrid) or None}
+        self.grids = OrderedDict()
+
+    def clear(self):
+        self.entries.clear()
+        self.mesh_users.clear()
+        self.dirty.clear()
+        self.grids.clear()
+
+    def mark_dirty(self, depsgraph):
+        """Marks the objects whose transform or mesh data changed.
+
+        Object-level geometry updates are ignored: they also come from modifier
+        re-evaluation (the wiggle preview), which leaves the indexed mesh untouched.
+        """
+        for update in depsgraph.updates:
+            id_data = update.id.original
+            if isinstance(id_data, bpy.types.Object):
+                if update.is_updated_transform:
+                    self.dirty.add(id_data.session_uid)
+            elif is_mesh_edit(update):
+                self.dirty.update(self.mesh_users.get(id_data.session_uid, ()))
+
+    def invalidate(self, objects):
+        """Forces the given objects to be re-read on the next query."""
+        self.dirty.update(obj.session_uid for obj in objects)
+
+    def _forget_cells(self, keys):
+        for grid in self.grids.values():
+            for key in keys:
+                grid["keys"].pop(key, None)
+            grid["table"] = None
+
+    def _refresh(self, objects):
+        """Re-reads the given objects and stores their entries."""
+        local, counts = gather_local_coordinates(objects)
+        matrices = world_matrices(objects)
+        world = transform_coordinates(local, counts, matrices)
+        offsets = np.cumsum(counts) - counts
+        for obj, matrix, start, count in zip(objects, matrices, offsets.tolist(), counts.tolist()):
+            key = obj.session_uid
+            mesh_key = obj.data.session_uid
+            previous = self.entries.get(key)
+            if previous is not None and previous[0] != mesh_key:
+                self.mesh_users.get(previous[0], set()).discard(key)
+            self.entries[key] = (mesh_key, local[start:start + count], matrix, world[start:start + count])
+            self.mesh_users.setdefault(mesh_key, set()).add(key)
+            self.dirty.discard(key)
+        self._forget_cells([obj.session_uid for obj in objects])
+
+    def gather(self, objects):
+        """Returns (local, counts, matrices, world) for ``objects``, re-reading only stale ones."""
+        stale = []
+        for obj in objects:
+            entry = self.entries.get(obj.session_uid)
+            if (entry is None or obj.session_uid in self.dirty or entry[0] != obj.data.session_uid
+                    or len(entry[1]) != len(obj.data.vertices)):
+                stale.append(obj)
+        if stale:
+            self._refresh(stale)
+
+        entries = [self.entries[obj.session_uid] for obj in objects]
+        counts = np.fromiter((len(entry[1]) for entry in entries), dtype=np.int64, count=len(entries))
+        if not entries:
+            empty = np.empty((0, 3))
+            return empty.astype(np.float32), counts, np.empty((0, 4, 4)), empty
+        local = np.concatenate([entry[1] for entry in entries])
+        matrices = np.array([entry[2] for entry in entries]).reshape(-1, 4, 4)
+        world = np.concatenate([entry[3] for entry in entries])
+        return local, counts, matrices, world
+
+    def grid(self, objects, cell_size, world=None):
+        """CellGrid over the world coordinates of ``objects`` with cells of ``cell_size``.
+
+        ``world`` is the gather() result of ``objects`` when the caller already has it.
+        """
+        if world is None:
+            world = self.gather(objects)[3]
+        cell_size = max(float(cell_size), MIN_CELL_SIZE)
+        grid = self.grids.get(cell_size)
+        if grid is None:
+            grid = self.grids[cell_size] = {"keys": {}, "table": None}
+            if len(self.grids) > MAX_GRIDS:
+                self.grids.popitem(last=False)
+        self.grids.move_to_end(cell_size)
+
+        uids = tuple(obj.session_uid for obj in objects)
+        if grid["table"] is not None and grid["table"][0] == uids:
+            return grid["table"][1]
+
+        keys = grid["keys"]
+        for uid in uids:
+            if uid not in keys:
+                keys[uid] = pack_cells(cell_coordinates(self.entries[uid][3], cell_size))
+        packed = np.concatenate([keys[uid] for uid in uids]) if uids else np.empty(0, dtype=np.int64)
+        table = CellGrid(world, packed, cell_size)
+        grid["table"] = (uids, table)
+        return table
+
+    @staticmethod
+    def nearest_cell_size(world):
+        """Cell size for nearest(): about two vertex spacings, as a power of two so it is reused."""
+        extents = np.sort(np.ptp(world, axis=0))[::-1]
+        # Track geometry is mostly a surface: spread the vertices over the two largest extents
+        area = extents[0] * max(extents[1], extents[0] / len(world))
+        size = max(2 * np.sqrt(area / len(world)), MIN_CELL_SIZE)
+        return float(2.0 ** np.round(np.log2(size)))
+
+    def nearest(self, points, objects):
+        """Closest vertex of ``objects`` to each point (world space).
+
+        Returns (positions, distances); without candidates every position is NaN.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        positions = np.full(points.shape, np.nan)
+        distances = np.full(len(points), np.inf)
+        world = self.gather(objects)[3]
+        if not len(world) or not len(points):
+            return positions, distances
+
+        # Any vertex closer than one cell is inside the searched cells. Farther points
+        # are searched again in coarser grids and, past the extent of the data,
+        # compared against every vertex.
+        pending = np.arange(len(points))
+        cell_size = self.nearest_cell_size(world)
+        extent = float(np.ptp(world, axis=0).max())
+        while len(pending) and cell_size <= extent * COARSEN_FACTOR:
+            found, found_distances = self.grid(objects, cell_size, world).closest(points[pending])
+            resolved = found_distances <= cell_size
+            positions[pending[resolved]] = found[resolved]
+            distances[pending[resolved]] = found_distances[resolved]
+            pending = pending[~resolved]
+            cell_size *= COARSEN_FACTOR
+
+        world_squared = (world ** 2).sum(axis=1)
+        for start in range(0, len(pending), QUERY_CHUNK):
+            chunk = pending[start:start + QUERY_CHUNK]
+            squared = world_squared[None, :] - 2 * points[chunk] @ world.T
+            closest = squared.argmin(axis=1)
+            positions[chunk] = world[closest]
+            distances[chunk] = np.linalg.norm(world[closest] - points[chunk], axis=1)
+        return positions, distances
+
+    def neighbour_pairs(self, objects, radius):
+        """Pairs (i, j), i < j, of vertices of ``objects`` (gather order) at most ``radius`` apart."""
+        return self.grid(objects, radius).pairs(radius)
+
+    def prune(self, scene):
+        """Drops the entries of objects that are no longer in the scene."""
+        alive = {obj.session_uid for obj in track_objects(scene)}
+        removed = [key for key in self.entries if key not in alive]
+        for key in removed:
+            mesh_key = self.entries.pop(key)[0]
+            self.mesh_users.get(mesh_key, set()).discard(key)
+            self.dirty.discard(key)
+        if removed:
+            self._forget_cells(removed)
+
+
+# Index shared by every snapping operator
+vertex_index = VertexSpatialIndex()
+
+
+@bpy.app.handlers.persistent
+def vertex_index_update_handler(scene, depsgraph):
+    """Marks the objects whose mesh or transform changed."""
+    vertex_index.mark_dirty(depsgraph)
+    # Objects were added or deleted: forget the removed ones
+    if depsgraph.id_type_updated('COLLECTION') or depsgraph.id_type_updated('SCENE'):
+        vertex_index.prune(scene)
+
+
+@bpy.app.handlers.persistent
+def vertex_index_reset_handler(*args):
+    """After loading a file or undoing, the index starts from scratch."""
+    vertex_index.clear()
+
+
+def register():
+    if vertex_index_update_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(vertex_index_update_handler)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if vertex_index_reset_handler not in handlers:
+            handlers.append(vertex_index_reset_handler)
+
+
+def unregister():
+    if vertex_index_update_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(vertex_index_update_handler)
+    for handlers in (bpy.app.handlers.load_post, bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if vertex_index_reset_handler in handlers:
+            handlers.remove(vertex_index_reset_handler)
+    vertex_index.clear()
@@ -2,6 +2,9 @@ import bpy
 
 # Nombre del objeto
 CUBE_NAME = "Range"
+# Dimensiones y posición del rango jugable
+RANGE_SIZE = (930, 980, 860)
+RANGE_LOCATION = (0, 0, -3.84012)
 
 # Propiedad booleana para el checkmark en Tool
 bpy.types.Scene.toggle_box = bpy.props.BoolProperty(name="Toggle Box", default=False)
@@ -18,7 +21,7 @@ def create_wireframe_cube():
     bpy.context.collection.objects.link(obj)
 
     # Definir los vértices del cubo con sus dimensiones
-    size_x, size_y, size_z = 930, 980, 860
+    size_x, size_y, size_z = RANGE_SIZE
     verts = [
         (-size_x / 2, -size_y / 2, -size_z / 2),  # 0
         (size_x / 2, -size_y / 2, -size_z / 2),   # 1
@@ -42,7 +45,7 @@ def create_wireframe_cube():
     mesh.update()
 
     # Ubicar el cubo en Z = -3.84012
-    obj.location = (0, 0, -3.84012)
+    obj.location = RANGE_LOCATION
 
     # Crear un material rojo para las aristas
     material = bpy.data.materials.get("RedWire")
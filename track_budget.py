@@ -0,0 +1,255 @@
+import bpy
+import time
+import numpy as np
+
+from .Find_invalid_data import BLOCK_INVALID, classify_objects, gather_world_coordinates, is_mesh_edit_or_transform
+from .toggle_box import CUBE_NAME, RANGE_LOCATION, RANGE_SIZE
+
+# Precision used to merge vertices shared by neighbouring blocks when counting
+VERTEX_WELD_PRECISION = 1e-3
+# Maximum number of out-of-range object names listed in the panel
+MAX_LISTED_OBJECTS = 10
+
+# Result of the last analysis, drawn by the panel
+budget_report = None
+
+
+def track_objects(scene):
+    """Mesh objects that belong to the track (the Range box itself is excluded)."""
+    return [obj for obj in scene.objects if obj.type == 'MESH' and obj.name != CUBE_NAME]
+
+
+def object_bounds(world, counts):
+    """Per-object world-space bounding boxes; objects without vertices get NaN bounds."""
+    count = len(counts)
+    mins = np.full((count, 3), np.nan)
+    maxs = np.full((count, 3), np.nan)
+    has_vertices = counts > 0
+    if len(world):
+        starts = (np.cumsum(counts) - counts)[has_vertices]
+        mins[has_vertices] = np.minimum.reduceat(world, starts, axis=0)
+        maxs[has_vertices] = np.maximum.reduceat(world, starts, axis=0)
+    return mins, maxs
+
+
+def count_textures(objects):
+    """Number of distinct images used by the image texture nodes of the objects' materials."""
+    materials = {slot.material for obj in objects for slot in obj.material_slots if slot.material}
+    images = set()
+    for material in materials:
+        if material.use_nodes:
+            for node in material.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image:
+                    images.add(node.image.name)
+    return len(images)
+
+
+def analyze_budget(scene):
+    """Computes block, vertex and texture totals and the world bounds of the whole track."""
+    start_time = time.time()
+    objects = track_objects(scene)
+
+    codes = classify_objects(objects)
+    blocks = int((codes != BLOCK_INVALID).sum())
+
+    world, counts = gather_world_coordinates(objects)
+    # Separated blocks share their border vertices once exported, so count unique positions
+    if len(world):
+        welded = np.round(world / VERTEX_WELD_PRECISION).astype(np.int64)
+        vertices = len(np.unique(welded, axis=0))
+    else:
+        vertices = 0
+
+    mins, maxs = object_bounds(world, counts)
+    half_size = np.array(RANGE_SIZE, dtype=np.float64) / 2
+    box_min = np.array(RANGE_LOCATION, dtype=np.float64) - half_size
+    box_max = np.array(RANGE_LOCATION, dtype=np.float64) + half_size
+    with np.errstate(invalid='ignore'):
+        outside = (mins < box_min).any(axis=1) | (maxs > box_max).any(axis=1)
+    out_of_range = [objects[index].name for index in np.flatnonzero(outside).tolist()]
+
+    textures = count_textures(objects)
+
+    overruns = []
+    if blocks > scene.budget_max_blocks:
+        overruns.append(f"Blocks: {blocks} / {scene.budget_max_blocks}")
+    if vertices > scene.budget_max_vertices:
+        overruns.append(f"Vertices: {vertices} / {scene.budget_max_vertices}")
+    if textures > scene.budget_max_textures:
+        overruns.append(f"Textures: {textures} / {scene.budget_max_textures}")
+    if out_of_range:
+        overruns.append(f"Out of range: {len(out_of_range)} objects")
+
+    has_bounds = len(world) > 0
+    return {
+        "blocks": blocks,
+        "vertices": vertices,
+        "textures": textures,
+        "bounds_min": world.min(axis=0).tolist() if has_bounds else None,
+        "bounds_max": world.max(axis=0).tolist() if has_bounds else None,
+        "out_of_range": out_of_range,
+        "overruns": overruns,
+        "elapsed": time.time() - start_time,
+    }
+
+
+def refresh_budget():
+    """One-shot timer that re-runs the analysis after the track changed."""
+    global budget_report
+    scene = bpy.context.scene
+    if scene is None or not scene.budget_auto_update:
+        return None
+    budget_report = analyze_budget(scene)
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return None
+
+
+@bpy.app.handlers.persistent
+def budget_update_handler(scene, depsgraph):
+    """Schedules a new analysis when geometry or transforms change (debounced)."""
+    if not scene.budget_auto_update:
+        return
+    if any(is_mesh_edit_or_transform(update) for update in depsgraph.updates):
+        if not bpy.app.timers.is_registered(refresh_budget):
+            bpy.app.timers.register(refresh_budget, first_interval=0.5)
+
+
+class OBJECT_OT_AnalyzeBudget(bpy.types.Operator):
+    """Compute block, vertex and texture totals and check the track against the play range"""
+    bl_idname = "geometry.analyze_budget"
+    bl_label = "Analyze Budget"
+
+    def execute(self, context):
+        global budget_report
+        budget_report = analyze_budget(context.scene)
+        if budget_report["overruns"]:
+            self.report({'WARNING'}, "Budget exceeded: " + "; ".join(budget_report["overruns"]))
+        else:
+            self.report({'INFO'}, f"Track within budget ({budget_report['elapsed']:.3f} seconds).")
+        return {'FINISHED'}
+
+
+class OBJECT_OT_SelectOutOfRange(bpy.types.Operator):
+    """Select the objects found outside the play range by the last analysis"""
+    bl_idname = "geometry.select_out_of_range"
+    bl_label = "Select Out of Range"
+
+    def execute(self, context):
+        if not budget_report or not budget_report["out_of_range"]:
+            self.report({'INFO'}, "No objects out of range.")
+            return {'CANCELLED'}
+
+        bpy.ops.object.select_all(action='DESELECT')
+        selected = 0
+        for name in budget_report["out_of_range"]:
+            obj = bpy.data.objects.get(name)
+            if obj and obj.visible_get():
+                obj.select_set(True)
+                selected += 1
+        self.report({'INFO'}, f"Selected {selected} objects out of range.")
+        return {'FINISHED'}
+
+
+class TrackBudgetPanel(bpy.types.Panel):
+    """Panel for the CTR budget analyzer"""
+    bl_label = "Track Budget"
+    bl_idname = "PT_TRACK_BUDGET"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Find Geometry"
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+        col = layout.column()
+
+        col.prop(scene, "budget_max_blocks", text="Max Blocks")
+        col.prop(scene, "budget_max_vertices", text="Max Vertices")
+        col.prop(scene, "budget_max_textures", text="Max Textures")
+        col.prop(scene, "budget_auto_update", text="Auto Update")
+        col.operator("geometry.analyze_budget", text="Analyze Budget")
+
+        if budget_report is None:
+            return
+
+        box = layout.box()
+        box.label(text=f"Blocks: {budget_report['blocks']} / {scene.budget_max_blocks}")
+        box.label(text=f"Vertices: {budget_report['vertices']} / {scene.budget_max_vertices}")
+        box.label(text=f"Textures: {budget_report['textures']} / {scene.budget_max_textures}")
+        if budget_report["bounds_min"] is not None:
+            size = [high - low for low, high in zip(budget_report["bounds_min"], budget_report["bounds_max"])]
+            box.label(text="Size: {:.1f} x {:.1f} x {:.1f}".format(*size))
+
+        for overrun in budget_report["overruns"]:
+            row = box.row()
+            row.alert = True
+            row.label(text=overrun, icon='ERROR')
+
+        out_of_range = budget_report["out_of_range"]
+        if out_of_range:
+            for name in out_of_range[:MAX_LISTED_OBJECTS]:
+                box.label(text=name, icon='OBJECT_DATA')
+            if len(out_of_range) > MAX_LISTED_OBJECTS:
+                box.label(text=f"... and {len(out_of_range) - MAX_LISTED_OBJECTS} more")
+            box.operator("geometry.select_out_of_range", text="Select Out of Range")
+
+
+classes = [
+    OBJECT_OT_AnalyzeBudget,
+    OBJECT_OT_SelectOutOfRange,
+    TrackBudgetPanel,
+]
+
+
+def register():
+    bpy.types.Scene.budget_max_blocks = bpy.props.IntProperty(
+        name="Max Blocks",
+        description="Maximum number of triblocks and quadblocks allowed in the track",
+        default=8192,
+        min=1
+    )
+    bpy.types.Scene.budget_max_vertices = bpy.props.IntProperty(
+        name="Max Vertices",
+        description="Maximum number of unique vertices allowed in the track",
+        default=65535,
+        min=1
+    )
+    bpy.types.Scene.budget_max_textures = bpy.props.IntProperty(
+        name="Max Textures",
+        description="Maximum number of distinct textures allowed in the track",
+        default=256,
+        min=1
+    )
+    bpy.types.Scene.budget_auto_update = bpy.props.BoolProperty(
+        name="Auto Update",
+        description="Re-run the analysis after every edit",
+        default=False
+    )
+
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+    if budget_update_handler not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(budget_update_handler)
+
+
+def unregister():
+    if budget_update_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(budget_update_handler)
+    if bpy.app.timers.is_registered(refresh_budget):
+        bpy.app.timers.unregister(refresh_budget)
+
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
+
+    del bpy.types.Scene.budget_max_blocks
+    del bpy.types.Scene.budget_max_vertices
+    del bpy.types.Scene.budget_max_textures
+    del bpy.types.Scene.budget_auto_update
+
+
+if __name__ == "__main__":
+    register()
@@ -0,0 +1,245 @@
+"""Binary container for UV animations (the ``.rtuv`` format).
+
+Holds the same data as the JSON written by "Export Animation Info" (per object, a
+list of frames with the UVs of every face and a texture), but as flat arrays that
+can be memory-mapped and handed to the playback engine without copying.
+
+Layout (little endian, every block aligned to 8 bytes):
+
+    header      magic "RTUV", version u16, encoding u16, object count u32,
+                texture count u32, texel scale f32, tables offset u64
+    blocks      per object: loop totals (u32 per face), UVs (frame count x loop
+                count x 2 values, float32 or uint16), frame info ((texture index
+                u32, valid u32) per frame; NO_TEXTURE if none)
+    tables      per texture: length u16 + UTF-8 path
+                per object: length u16 + UTF-8 name, face count u32, loop count u32,
+                frame count u32, then u64 offsets of its loop totals, frame info and UVs
+
+The tables go last so the file is written one object (and one frame) at a time.
+uint16 UVs are texel-quantized: ``uv = (value - 32768) / texel_scale``.
+
+Convert a JSON file from the command line with:
+
+    python uv_sequence_format.py animation.json animation.rtuv [--uint16 --texel-scale 4096]
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b"RTUV"
+VERSION = 2
+EXTENSION = ".rtuv"
+
+ENCODING_FLOAT32 = 0
+ENCODING_UINT16 = 1
+ENCODING_DTYPES = {ENCODING_FLOAT32: np.dtype("<f4"), ENCODING_UINT16: np.dtype("<u2")}
+# Steps per UV unit of the uint16 encoding (1/16 of a texel of a 256 px texture)
+DEFAULT_TEXEL_SCALE = 4096.0
+UINT16_ZERO = 32768
+NO_TEXTURE = 0xFFFFFFFF
+
+HEADER = struct.Struct("<4sHHIIfQ")
+OBJECT_ENTRY = struct.Struct("<IIIQQQ")
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def _string(value):
+    data = value.encode("utf-8")
+    return struct.pack("<H", len(data)) + data
+
+
+def _write_block(file, array):
+    """Writes ``array`` at the next aligned position of ``file`` and returns its offset."""
+    offset = _align(file.tell())
+    file.write(b"\0" * (offset - file.tell()))
+    file.write(np.ascontiguousarray(array).tobytes())
+    return offset
+
+
+def _encode_frame(face_uvs, dtype, encoding, texel_scale, name):
+    values = np.array([uv for face in face_uvs for uv in face], dtype=np.float64).ravel()
+    if encoding == ENCODING_UINT16:
+        values = np.round(values * texel_scale) + UINT16_ZERO
+        if values.size and (values.min() < 0 or values.max() > 0xFFFF):
+            raise ValueError(f"UVs of {name} do not fit in uint16 with texel scale {texel_scale}")
+    return values.astype(dtype)
+
+
+def _write_object(file, name, obj_data, encoding, texel_scale, texture_ids):
+    """Streams the frames of one object (JSON structure) to ``file``; returns its table entry.
+
+    The face structure is taken from the first frame with faces; frames with another
+    structure are stored as invalid. Only one frame is held in memory at a time.
+    """
+    dtype = ENCODING_DTYPES[encoding]
+    frames_data = obj_data.get("frames") or {}
+    frame_count = len(frames_data)
+    frames = [frames_data.get(str(index)) or {} for index in range(frame_count)]
+    sizes = next(([len(uvs) for uvs in frame["UVs"]] for frame in frames if frame.get("UVs")), [])
+    loop_count = sum(sizes)
+
+    totals_offset = _write_block(file, np.array(sizes, dtype="<u4"))
+    uvs_offset = _align(file.tell())
+    file.write(b"\0" * (uvs_offset - file.tell()))
+    info = np.zeros((frame_count, 2), dtype="<u4")
+    empty = np.zeros(loop_count * 2, dtype=dtype)
+    for index, frame in enumerate(frames):
+        texture = frame.get("Texture")
+        if texture and texture != "No Texture":
+            texture = texture.replace("\\", "/")
+            info[index, 0] = texture_ids.setdefault(texture, len(texture_ids))
+        else:
+            info[index, 0] = NO_TEXTURE
+        face_uvs = frame.get("UVs") or []
+        valid = [len(face) for face in face_uvs] == sizes
+        info[index, 1] = valid
+        values = _encode_frame(face_uvs, dtype, encoding, texel_scale, name) if valid else empty
+        file.write(values.tobytes())
+    info_offset = _write_block(file, info)
+    return _string(name) + OBJECT_ENTRY.pack(len(sizes), loop_count, frame_count,
+                                             totals_offset, info_offset, uvs_offset)
+
+
+def write_uv_sequence(path, animations, encoding=ENCODING_FLOAT32, texel_scale=DEFAULT_TEXEL_SCALE):
+    """Writes ``animations`` to ``path``, one object at a time.
+
+    ``animations`` maps object names to {"frames": {...}} as in the JSON, or is an
+    iterable of (name, data) pairs that is consumed once. Raises ValueError (and
+    removes the partial file) if a UV does not fit the uint16 range at ``texel_scale``.
+    """
+    items = animations.items() if isinstance(animations, dict) else animations
+    texture_ids = {}
+    entries = []
+    try:
+        with open(path, "wb") as file:
+            file.write(b"\0" * HEADER.size)
+            for name, obj_data in items:
+                entries.append(_write_object(file, name, obj_data, encoding, texel_scale, texture_ids))
+
+            tables_offset = _align(file.tell())
+            file.write(b"\0" * (tables_offset - file.tell()))
+            for texture in texture_ids:  # Insertion order is the index order
+                file.write(_string(texture))
+            for entry in entries:
+                file.write(entry)
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, encoding, len(entries), len(texture_ids), texel_scale,
+                                   tables_offset))
+    except ValueError:
+        os.remove(path)
+        raise
+
+
+def convert_json(json_path, output_path, encoding=ENCODING_FLOAT32, texel_scale=DEFAULT_TEXEL_SCALE):
+    """Converts a JSON written by "Export Animation Info" to the binary format.
+
+    The whole JSON is parsed first (it is not a streamable format); each object is
+    then released as soon as it is written.
+    """
+    with open(json_path, "r", encoding="utf-8") as file:
+        animations = json.load(file)
+
+    def drain():
+        for name in list(animations):
+            yield name, animations.pop(name)
+
+    write_uv_sequence(output_path, drain(), encoding, texel_scale)
+
+
+class UVSequenceObject:
+    """Animation of one object inside a memory-mapped file; frames are views of the map."""
+
+    def __init__(self, sequence, name, face_count, loop_count, frame_count, totals_offset, info_offset, uvs_offset):
+        buffer = sequence.buffer
+        self.name = name
+        self.encoding = sequence.encoding
+        self.texel_scale = sequence.texel_scale
+        self.loop_totals = np.frombuffer(buffer, dtype="<u4", count=face_count, offset=totals_offset)
+        info = np.frombuffer(buffer, dtype="<u4", count=frame_count * 2, offset=info_offset).reshape(-1, 2)
+        self.valid = info[:, 1] != 0
+        self.textures = [sequence.textures[index] if index != NO_TEXTURE else None for index in info[:, 0].tolist()]
+        dtype = ENCODING_DTYPES[self.encoding]
+        self.raw_frames = np.frombuffer(buffer, dtype=dtype, count=frame_count * loop_count * 2,
+                                        offset=uvs_offset).reshape(frame_count, loop_count * 2)
+
+    @property
+    def frame_count(self):
+        return len(self.raw_frames)
+
+    def frame(self, index):
+        """UVs of a frame as float32 in loop order (zero-copy for the float32 encoding), or None."""
+        if not self.valid[index]:
+            return None
+        raw = self.raw_frames[index]
+        if self.encoding == ENCODING_FLOAT32:
+            return raw
+        return ((raw.astype(np.float32) - UINT16_ZERO) / self.texel_scale).astype(np.float32)
+
+
+class UVSequenceFile:
+    """Read-only, memory-mapped ``.rtuv`` file. Keep it open while its frames are in use."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+
+        (magic, version, self.encoding, object_count, texture_count, self.texel_scale,
+         offset) = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION or self.encoding not in ENCODING_DTYPES:
+            self.close()
+            raise ValueError(f"{path} is not a supported UV sequence file")
+
+        self.textures = []
+        for _ in range(texture_count):
+            value, offset = self._read_string(offset)
+            self.textures.append(value)
+
+        self.objects = {}
+        for _ in range(object_count):
+            name, offset = self._read_string(offset)
+            entry = OBJECT_ENTRY.unpack_from(self.buffer, offset)
+            offset += OBJECT_ENTRY.size
+            self.objects[name] = UVSequenceObject(self, name, *entry)
+
+    def _read_string(self, offset):
+        (length,) = struct.unpack_from("<H", self.buffer, offset)
+        start = offset + 2
+        return bytes(self.buffer[start:start + length]).decode("utf-8"), start + length
+
+    def close(self):
+        """Releases the map. Frames already handed out must not be used afterwards."""
+        self.objects = {}
+        try:
+            self.buffer.close()
+        except BufferError:
+            pass  # Views still alive: the map is freed with them
+        self._file.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert a UV animation JSON to the binary .rtuv format.")
+    parser.add_argument("json_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--uint16", action="store_true", help="Store texel-quantized uint16 UVs instead of float32")
+    parser.add_argument("--texel-scale", type=float, default=DEFAULT_TEXEL_SCALE, help="Steps per UV unit (uint16)")
+    args = parser.parse_args()
+    encoding = ENCODING_UINT16 if args.uint16 else ENCODING_FLOAT32
+    convert_json(args.json_path, args.output_path, encoding, args.texel_scale)
+
+
+if __name__ == "__main__":
+    main()